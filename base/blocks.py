@@ -9,6 +9,8 @@ from wagtail.blocks import (
 from wagtail.embeds.blocks import EmbedBlock
 from wagtail.images.blocks import ImageBlock
 
+from base.search_text import HEADINGS
+
 
 class CaptionedImageBlock(StructBlock):
     image = ImageBlock(required=True)
@@ -33,6 +35,9 @@ class HeadingBlock(StructBlock):
         required=False,
     )
 
+    def get_search_text(self, value):
+        return {HEADINGS: [value["heading_text"]]}
+
     class Meta:
         icon = "title"
         template = "base/blocks/heading_block.html"
@@ -0,0 +1,42 @@
+import time
+
+from django.core.cache import cache as default_cache
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """File cache shared by every process of a node, with throttled culling.
+
+    Django's backend lists the whole cache directory on every write to check
+    ``MAX_ENTRIES``. This one checks at most once every ``CULL_INTERVAL``
+    seconds (an ``OPTIONS`` key, default 60) per process, so the directory
+    may briefly hold a few more entries than ``MAX_ENTRIES``.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_interval = int(params.get("OPTIONS", {}).get("CULL_INTERVAL", 60))
+        self._next_cull = 0
+
+    def _cull(self):
+        now = time.monotonic()
+        if now < self._next_cull:
+            return
+        self._next_cull = now + self._cull_interval
+        super()._cull()
+
+
+def get_version(key, cache=default_cache):
+    """Return the version token stored under ``key``, creating it if missing.
+
+    Cached values whose keys embed the token are dropped all at once by
+    ``bump_version``.
+    """
+    return cache.get_or_set(key, time.time_ns, None)
+
+
+def bump_version(key, cache=default_cache):
+    # A fresh token rather than incr(): incr() is a get then a set on most
+    # backends, racy between processes, and a counter recreated after being
+    # culled would bring back the values cached under its old numbers.
+    cache.set(key, time.time_ns(), None)
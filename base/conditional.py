@@ -0,0 +1,58 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Unix time of the last change that can alter any page's HTML without
+# touching the page itself: a publish elsewhere (listings, menus), a move,
+# a footer or an image. Part of every page's validators, so it must live in
+# a cache shared by all the workers (the default alias, see CACHE_DIR): a
+# worker that missed the change would otherwise keep answering 304.
+CHANGED_AT_KEY = "base:content_changed_at"
+
+
+def mark_content_changed():
+    cache.set(CHANGED_AT_KEY, time.time(), None)
+
+
+def get_content_changed_at():
+    return cache.get_or_set(CHANGED_AT_KEY, time.time, None)
+
+
+class ConditionalGetMixin:
+    """Answer conditional GETs of a page with 304 before rendering it.
+
+    The ``ETag`` and ``Last-Modified`` validators are computed from the live
+    revision and publish date of the page plus the site-wide change time, so
+    checking them costs no query.
+    """
+
+    def get_validators(self, request):
+        """Return ``(etag, last_modified)``, ``last_modified`` as a Unix time."""
+        changed_at = get_content_changed_at()
+        published_at = self.last_published_at.timestamp() if self.last_published_at else 0
+        signature = ":".join(str(part) for part in (
+            self.pk,
+            self.live_revision_id,
+            changed_at,
+            translation.get_language(),
+            request.user.is_authenticated,
+        ))
+        etag = 'W/"%s"' % hashlib.md5(signature.encode()).hexdigest()
+        return etag, int(max(published_at, changed_at))
+
+    def serve(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or getattr(request, "is_preview", False):
+            return super().serve(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().serve(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.setdefault("ETag", etag)
+                response.setdefault("Last-Modified", http_date(last_modified))
+        return response
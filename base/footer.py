@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.safestring import mark_safe
+from wagtail.coreutils import get_supported_content_language_variant
+from wagtail.rich_text import expand_db_html
+
+from base.cache import bump_version, get_version
+
+# Bumped when a footer is published, unpublished or deleted.
+VERSION_KEY = "base:footer_version"
+FOOTER_CACHE_KEY = "base:footer:{language}:{version}"
+FOOTER_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def invalidate_footer():
+    bump_version(VERSION_KEY)
+
+
+def render_footer_text(body):
+    return mark_safe(expand_db_html(body)) if body else ""
+
+
+def get_footer_html():
+    """Return the rendered live footer for the active language.
+
+    Falls back to any live footer when the language has none. The HTML is
+    cached, so warm requests make no footer queries.
+    """
+    from base.models import FooterText
+
+    language = get_supported_content_language_variant(translation.get_language())
+    version = get_version(VERSION_KEY)
+    key = FOOTER_CACHE_KEY.format(language=language, version=version)
+    html = cache.get(key)
+    if html is None:
+        live = FooterText.objects.filter(live=True)
+        instance = live.filter(locale__language_code=language).first() or live.first()
+        html = render_footer_text(instance.body) if instance else ""
+        cache.set(key, html, FOOTER_CACHE_TIMEOUT)
+    return mark_safe(html)
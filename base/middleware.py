@@ -0,0 +1,53 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from base import page_cache
+
+
+class AnonymousPageCacheMiddleware:
+    """Serve anonymous GETs of Wagtail pages from the page cache.
+
+    Only responses of pages served by Wagtail (see ``base.wagtail_hooks``)
+    are stored, and never for excluded page types, logged-in users, previews
+    or responses setting cookies. Off unless ``PAGE_CACHE_ENABLED`` is set.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            not page_cache.is_enabled()
+            or request.method != "GET"
+            or request.user.is_authenticated
+        ):
+            return self.get_response(request)
+
+        key = page_cache.entry_key(request)
+        if key is None:
+            return self.get_response(request)
+        cache = page_cache.get_page_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return self.replay(request, cached)
+
+        response = self.get_response(request)
+        if page_cache.is_cacheable(request, response):
+            cached = page_cache.CachedPage.from_response(response)
+            cache.set(key, cached, page_cache.get_timeout())
+            response["ETag"] = cached.etag
+            response["X-Page-Cache"] = "MISS"
+        return response
+
+    def replay(self, request, cached):
+        if request.META.get("HTTP_IF_NONE_MATCH") == cached.etag:
+            response = HttpResponseNotModified()
+        elif "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+            response = HttpResponse(cached.body, content_type=cached.content_type)
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(cached.content(), content_type=cached.content_type)
+        response["ETag"] = cached.etag
+        response["X-Page-Cache"] = "HIT"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
@@ -0,0 +1,63 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from wagtail.models import Site
+
+from base.cache import bump_version, get_version
+
+MenuItem = namedtuple("MenuItem", ["title", "url"])
+Menu = namedtuple("Menu", ["site_name", "root", "items"])
+
+# Bumped by any change that can alter a menu: publish, unpublish, move,
+# delete, site changes. Every cached menu and site lookup is keyed on it.
+VERSION_KEY = "base:menu_version"
+SITE_CACHE_KEY = "base:site_for_host:{host}:{version}"
+MENU_CACHE_KEY = "base:menu:{site_id}:{version}"
+MENU_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def invalidate_menus():
+    bump_version(VERSION_KEY)
+
+
+def get_site_id_for_request(request, version=None):
+    """Like ``Site.find_for_request(request).pk``, cached per host."""
+    version = version or get_version(VERSION_KEY)
+    key = SITE_CACHE_KEY.format(host=request.get_host(), version=version)
+    site_id = cache.get(key)
+    if site_id is None:
+        site = Site.find_for_request(request)
+        site_id = site.pk if site else 0
+        cache.set(key, site_id, MENU_CACHE_TIMEOUT)
+    return site_id or None
+
+
+def build_menu(site, request=None):
+    root = site.root_page
+    return Menu(
+        site_name=site.site_name,
+        root=MenuItem(root.title, root.get_url(request=request)),
+        items=[
+            MenuItem(page.title, page.get_url(request=request))
+            for page in root.get_children().live().in_menu()
+        ],
+    )
+
+
+def get_menu(request):
+    """Return the navigation ``Menu`` of the request's site, or ``None``.
+
+    Menus are built once per site and served from the cache until a page is
+    published, unpublished, moved or deleted.
+    """
+    version = get_version(VERSION_KEY)
+    site_id = get_site_id_for_request(request, version)
+    if site_id is None:
+        return None
+    key = MENU_CACHE_KEY.format(site_id=site_id, version=version)
+    menu = cache.get(key)
+    if menu is None:
+        site = Site.objects.select_related("root_page").get(pk=site_id)
+        menu = build_menu(site, request)
+        cache.set(key, menu, MENU_CACHE_TIMEOUT)
+    return menu
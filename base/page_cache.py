@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from wagtail.models import Page
+
+from base.cache import bump_version, get_version
+from base.navigation import get_site_id_for_request
+from base.render_cache import referencing_pages
+
+# Full responses served to anonymous readers. Each path has its own version,
+# bumped when a page shown at that path is purged; the global version drops
+# every entry at once (menus and the footer appear on all pages).
+GLOBAL_VERSION_KEY = "pagecache:version"
+PATH_VERSION_KEY = "pagecache:path:{site_id}:{path}"
+ENTRY_KEY = "pagecache:entry:{site_id}:{path}:{params}:{path_version}:{version}"
+
+
+def is_enabled():
+    return getattr(settings, "PAGE_CACHE_ENABLED", False)
+
+
+def get_page_cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 60 * 5)
+
+
+def invalidate_all_pages():
+    if is_enabled():
+        bump_version(GLOBAL_VERSION_KEY, get_page_cache())
+
+
+def _referencing(obj):
+    page_ids = [pk for ids in referencing_pages(obj).values() for pk in ids]
+    return list(Page.objects.filter(pk__in=page_ids)) if page_ids else []
+
+
+def affected_pages(page):
+    """Pages whose response shows ``page``: the page itself, its parent
+    (index pages list their children), the tag index pages for blog posts and
+    every page referencing it."""
+    from blog.models import BlogPage, BlogTagIndexPage
+
+    pages = [page]
+    parent = page.get_parent()
+    if parent is not None:
+        pages.append(parent)
+    if issubclass(page.specific_class, BlogPage):
+        pages += BlogTagIndexPage.objects.live()
+    return pages + _referencing(page)
+
+
+def purge_pages(pages):
+    """Drop the cached responses of ``pages``, at all their query strings."""
+    if not is_enabled():
+        return
+    cache = get_page_cache()
+    for page in pages:
+        url_parts = page.get_url_parts()
+        if url_parts is not None:
+            site_id, _root_url, path = url_parts
+            bump_version(PATH_VERSION_KEY.format(site_id=site_id, path=path), cache)
+
+
+def purge_page(page):
+    if is_enabled():
+        purge_pages(affected_pages(page))
+
+
+def purge_references_to(obj):
+    if is_enabled():
+        purge_pages(_referencing(obj))
+
+
+def is_excluded(page):
+    excluded = getattr(settings, "PAGE_CACHE_EXCLUDED_PAGE_TYPES", [])
+    return page.specific_class._meta.label in excluded
+
+
+class CachedPage:
+    """A cached response: gzip-compressed body plus the headers needed to
+    replay it."""
+
+    __slots__ = ("etag", "content_type", "body")
+
+    def __init__(self, etag, content_type, body):
+        self.etag = etag
+        self.content_type = content_type
+        self.body = body
+
+    @classmethod
+    def from_response(cls, response):
+        content = response.content
+        etag = response.get("ETag") or '"%s"' % hashlib.md5(content).hexdigest()
+        return cls(etag, response["Content-Type"], gzip.compress(content))
+
+    def content(self):
+        return gzip.decompress(self.body)
+
+
+def entry_key(request):
+    """Return the cache key of the request's response, or ``None`` when the
+    request's host is not a Wagtail site."""
+    site_id = get_site_id_for_request(request)
+    if site_id is None:
+        return None
+    path = request.path
+    # Missing versions get a fresh token rather than a default, so that a
+    # culled version key can't bring back the entries stored under it
+    cache = get_page_cache()
+    path_version = get_version(PATH_VERSION_KEY.format(site_id=site_id, path=path), cache)
+    version = get_version(GLOBAL_VERSION_KEY, cache)
+    allowed = getattr(settings, "PAGE_CACHE_QUERY_PARAMS", [])
+    params = urlencode(sorted(
+        (name, value) for name, value in request.GET.items() if name in allowed
+    ))
+    return ENTRY_KEY.format(
+        site_id=site_id,
+        path=path,
+        params=params,
+        path_version=path_version,
+        version=version,
+    )
+
+
+def is_cacheable(request, response):
+    page = getattr(request, "page_cache_page", None)
+    cache_control = response.get("Cache-Control", "")
+    return (
+        page is not None
+        and not is_excluded(page)
+        and not page.get_view_restrictions().exists()
+        and response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_USED")
+        and "private" not in cache_control
+        and "no-store" not in cache_control
+    )
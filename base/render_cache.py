@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.utils.safestring import mark_safe
+from wagtail.fields import StreamField
+from wagtail.models import Page, ReferenceIndex
+
+RENDER_CACHE_KEY = "streamfield:{page_id}:{revision_id}:{field_name}"
+RENDER_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_render_cache():
+    return caches[getattr(settings, "STREAMFIELD_CACHE_ALIAS", "default")]
+
+
+def _key(page_id, revision_id, field_name):
+    return RENDER_CACHE_KEY.format(
+        page_id=page_id, revision_id=revision_id, field_name=field_name
+    )
+
+
+def render_streamfield(page, field_name, context):
+    """Render a page's StreamField, reusing the HTML of its live revision.
+
+    Previews and pages without a live revision are always rendered.
+    """
+    value = getattr(page, field_name)
+    request = context.get("request")
+    in_preview = getattr(request, "is_preview", False)
+    if in_preview or not page.live_revision_id:
+        return value.render_as_block(context=context)
+
+    cache = get_render_cache()
+    key = _key(page.pk, page.live_revision_id, field_name)
+    html = cache.get(key)
+    if html is None:
+        html = value.render_as_block(context=context)
+        cache.set(key, html, RENDER_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def streamfield_names(model):
+    return [
+        field.name for field in model._meta.get_fields() if isinstance(field, StreamField)
+    ]
+
+
+def invalidate_pages(page_ids_by_model):
+    """Drop the cached StreamField HTML of the given pages.
+
+    ``page_ids_by_model`` maps a page model to the ids of its pages.
+    """
+    keys = []
+    for model, page_ids in page_ids_by_model.items():
+        field_names = streamfield_names(model)
+        if not field_names:
+            continue
+        revisions = Page.objects.filter(pk__in=page_ids, live_revision__isnull=False)
+        for page_id, revision_id in revisions.values_list("pk", "live_revision_id"):
+            keys += [_key(page_id, revision_id, name) for name in field_names]
+    if keys:
+        get_render_cache().delete_many(keys)
+
+
+def referencing_pages(obj):
+    """Return ``{page model: [page ids]}`` for every page that references
+    ``obj`` (chosen pages, images, rich text links), per Wagtail's reference
+    index."""
+    page_content_type = ContentType.objects.get_for_model(Page)
+    references = ReferenceIndex.get_references_to(obj).filter(
+        base_content_type=page_content_type
+    )
+    page_ids_by_model = {}
+    for content_type_id, object_id in references.values_list(
+        "content_type_id", "object_id"
+    ).distinct():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is not None:
+            page_ids_by_model.setdefault(model, []).append(int(object_id))
+    return page_ids_by_model
+
+
+def invalidate_references_to(obj):
+    """Drop the cached StreamField HTML of every page that references ``obj``."""
+    invalidate_pages(referencing_pages(obj))
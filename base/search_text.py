@@ -0,0 +1,45 @@
+from django.utils.html import strip_tags
+from wagtail.blocks import ListBlock, RichTextBlock, StreamBlock, StructBlock
+
+# Kinds of text a block can contribute to the search index. Each kind is
+# indexed as its own field so it can be weighted, see BlogPage.search_fields.
+HEADINGS = "headings"
+TEXT = "text"
+CODE = "code"
+
+
+def block_search_text(block, value):
+    """Return ``{kind: [text, ...]}`` for a block value.
+
+    Blocks can define ``get_search_text(value)`` to say what they contribute;
+    structural blocks are walked, rich text is reduced to plain text and any
+    other block falls back to its ``get_searchable_content()``.
+    """
+    if not block.search_index:
+        return {}
+    hook = getattr(block, "get_search_text", None)
+    if hook is not None:
+        return hook(value)
+    if isinstance(block, RichTextBlock):
+        return {TEXT: [strip_tags(value.source)]}
+    if isinstance(block, StreamBlock):
+        children = [(child.block, child.value) for child in value]
+    elif isinstance(block, ListBlock):
+        children = [(block.child_block, child) for child in value]
+    elif isinstance(block, StructBlock):
+        children = [(child, value.get(name)) for name, child in block.child_blocks.items()]
+    else:
+        return {TEXT: block.get_searchable_content(value)}
+
+    texts = {}
+    for child_block, child_value in children:
+        for kind, child_texts in block_search_text(child_block, child_value).items():
+            texts.setdefault(kind, []).extend(child_texts)
+    return texts
+
+
+def stream_search_text(stream_value):
+    """Return ``{kind: text}`` for a StreamField value, each kind's texts
+    joined into one string."""
+    texts = block_search_text(stream_value.stream_block, stream_value)
+    return {kind: "\n".join(filter(None, parts)) for kind, parts in texts.items()}
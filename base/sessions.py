@@ -0,0 +1,32 @@
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class SessionStore(CachedDBStore):
+    """Cached database sessions whose database write can be deferred.
+
+    Like ``cached_db``, sessions are read from the cache and fall back to the
+    database. A view can call ``defer_db_write()`` so that the session is
+    only written to the cache at the end of the request; the next save
+    without it (an exam start or submit, a login, ...) writes the database
+    row too. Should the cache lose the session in between, the database
+    copy, as of the last boundary, is loaded instead.
+
+    The cache must be shared by all the processes serving requests, see
+    ``SESSION_CACHE_ALIAS``; with a ``LocMemCache`` nothing is deferred.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._defer_db_write = False
+
+    def defer_db_write(self):
+        # A per-process cache would lose the session to the next request
+        # served by another worker: keep writing the database then.
+        if not isinstance(self._cache, LocMemCache):
+            self._defer_db_write = True
+
+    def save(self, must_create=False):
+        if not self._defer_db_write or must_create or self.session_key is None:
+            return super().save(must_create=must_create)
+        self._cache.set(self.cache_key, self._session, self.get_expiry_age())
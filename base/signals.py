@@ -0,0 +1,95 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+    published,
+    unpublished,
+)
+
+from base.conditional import mark_content_changed
+from base.footer import invalidate_footer
+from base.models import FooterText
+from base.navigation import invalidate_menus
+from base.page_cache import (
+    invalidate_all_pages,
+    purge_page,
+    purge_references_to,
+)
+from base.render_cache import invalidate_references_to
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def page_published_or_unpublished(sender, instance, **kwargs):
+    mark_content_changed()
+    # Menu pages appear in every page's header
+    if instance.show_in_menus:
+        invalidate_all_pages()
+    else:
+        purge_page(instance)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(page_slug_changed)
+def page_changed(sender, instance, **kwargs):
+    invalidate_menus()
+    # Footer rich text may link to the page
+    invalidate_footer()
+    # The page's own HTML is keyed on its live revision; only the pages
+    # showing its title, URL or content need dropping.
+    invalidate_references_to(instance)
+
+
+@receiver(post_page_move)
+def page_moved(sender, instance, **kwargs):
+    invalidate_menus()
+    invalidate_footer()
+    invalidate_references_to(instance)
+
+
+@receiver(page_slug_changed)
+@receiver(post_page_move)
+def page_url_changed(sender, instance, **kwargs):
+    mark_content_changed()
+    # Old URLs of the page and its descendants must stop being served
+    invalidate_all_pages()
+
+
+@receiver(post_delete)
+def page_deleted(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        invalidate_menus()
+        invalidate_references_to(instance)
+        invalidate_all_pages()
+        mark_content_changed()
+
+
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+def image_changed(sender, instance, **kwargs):
+    mark_content_changed()
+    invalidate_references_to(instance)
+    purge_references_to(instance)
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def site_changed(sender, instance, **kwargs):
+    mark_content_changed()
+    invalidate_menus()
+    invalidate_all_pages()
+
+
+@receiver(published, sender=FooterText)
+@receiver(unpublished, sender=FooterText)
+@receiver(post_delete, sender=FooterText)
+def footer_changed(sender, instance, **kwargs):
+    mark_content_changed()
+    invalidate_footer()
+    invalidate_all_pages()
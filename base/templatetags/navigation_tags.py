@@ -1,23 +1,28 @@
 from django import template
 
-from base.models import FooterText
+from base.footer import get_footer_html, render_footer_text
+from base.navigation import get_menu as get_cached_menu
 
 register = template.Library()
-from wagtail.models import Site
+
 
 @register.inclusion_tag("base/includes/footer_text.html", takes_context=True)
 def get_footer_text(context):
+    # Previews pass the footer being edited in the context
     footer_text = context.get("footer_text", "")
 
-    if not footer_text:
-        instance = FooterText.objects.filter(live=True).first()
-        footer_text = instance.body if instance else ""
+    if footer_text:
+        footer_html = render_footer_text(footer_text)
+    else:
+        footer_html = get_footer_html()
 
     return {
-        "footer_text": footer_text,
+        "footer_html": footer_html,
     }
 
 
 @register.simple_tag(takes_context=True)
-def get_site_root(context):
-    return Site.find_for_request(context["request"]).root_page
\ No newline at end of file
+def get_menu(context):
+    """The site's navigation as ``menu.root`` and ``menu.items``, each a
+    ``(title, url)`` pair, served from the cache."""
+    return get_cached_menu(context["request"])
@@ -0,0 +1,11 @@
+from django import template
+
+from base.render_cache import render_streamfield
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def cached_streamfield(context, page, field_name="body"):
+    """Render ``page.<field_name>``, cached per page and live revision."""
+    return render_streamfield(page, field_name, context.flatten())
@@ -1,3 +1,242 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from wagtail.models import Page, Site
+
+from base.cache import FileBasedCache
+from base.models import FooterText
+from base.page_cache import PATH_VERSION_KEY, get_page_cache, purge_pages
+from base.sessions import SessionStore
+from blog.models import BlogTagIndexPage
+from blog.testing import BlogTestMixin
+from quiz.models import ExamQuestion, ExamType, MockExamPage
+
+
+class NavigationMenuTests(TestCase):
+    """
+    Tests for the cached navigation menu in includes/header.html.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.home = Site.objects.get(is_default_site=True).root_page
+
+    def render_header(self):
+        request = RequestFactory().get("/", SERVER_NAME="localhost")
+        request.user = AnonymousUser()
+        return render_to_string("includes/header.html", {"request": request})
+
+    def add_page(self, title, show_in_menus=True):
+        page = Page(title=title, show_in_menus=show_in_menus)
+        self.home.add_child(instance=page)
+        page.save_revision().publish()
+        return page
+
+    def test_warm_header_makes_no_queries(self):
+        self.add_page("About")
+        self.render_header()
+        with self.assertNumQueries(0):
+            html = self.render_header()
+        self.assertIn('<a href="/about/">About</a>', html)
+
+    def test_menu_updates_on_publish_and_unpublish(self):
+        self.assertNotIn("Projects", self.render_header())
+        page = self.add_page("Projects")
+        self.add_page("Hidden", show_in_menus=False)
+        html = self.render_header()
+        self.assertIn("Projects", html)
+        self.assertNotIn("Hidden", html)
+
+        page.unpublish()
+        self.assertNotIn("Projects", self.render_header())
+
+
+class FooterTextTests(TestCase):
+    """
+    Tests for the cached footer text.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def render_footer(self):
+        return render_to_string("includes/footer.html", {"request": RequestFactory().get("/")})
+
+    def test_warm_footer_makes_no_queries(self):
+        footer = FooterText.objects.create(body="<p>Hello footer</p>", live=False)
+        footer.save_revision().publish()
+        self.render_footer()
+        with self.assertNumQueries(0):
+            html = self.render_footer()
+        self.assertIn("<p>Hello footer</p>", html)
+
+    def test_footer_refreshed_on_publish_and_unpublish(self):
+        footer = FooterText.objects.create(body="<p>First</p>", live=False)
+        footer.save_revision().publish()
+        self.assertIn("First", self.render_footer())
+
+        footer.body = "<p>Second</p>"
+        footer.save_revision().publish()
+        self.assertIn("Second", self.render_footer())
+
+        footer.refresh_from_db()
+        footer.unpublish()
+        self.assertNotIn("Second", self.render_footer())
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class AnonymousPageCacheTests(BlogTestMixin, TestCase):
+    """
+    Tests for the anonymous full-page cache middleware.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_page_cache().clear()
+        self.blog = self.make_index()
+        self.home = Site.objects.get(is_default_site=True).root_page
+        self.tags = self.home.add_child(instance=BlogTagIndexPage(title="Tags", slug="tags"))
+
+    def test_second_anonymous_request_is_served_from_cache(self):
+        post = self.make_post(self.blog, "Post", tags=["django"])
+        first = self.client.get(post.url)
+        self.assertEqual(first["X-Page-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get(post.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(second["X-Page-Cache"], "HIT")
+        self.assertEqual(second["Content-Encoding"], "gzip")
+        third = self.client.get(post.url)
+        self.assertEqual(third.content, first.content)
+
+        not_modified = self.client.get(post.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_query_params_outside_the_allow_list_share_an_entry(self):
+        self.client.get(self.blog.url, {"page": 1})
+        self.assertEqual(
+            self.client.get(self.blog.url, {"page": 1, "utm_source": "x"})["X-Page-Cache"],
+            "HIT",
+        )
+        self.assertEqual(self.client.get(self.blog.url, {"page": 2})["X-Page-Cache"], "MISS")
+
+    def test_publish_purges_the_page_its_parent_and_tag_pages(self):
+        post = self.make_post(self.blog, "Post", tags=["django"])
+        for url in (post.url, self.blog.url, self.tags.url + "?tag=django"):
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)["X-Page-Cache"], "HIT")
+
+        post.intro = "Updated intro"
+        post.save_revision().publish()
+        for url in (post.url, self.blog.url, self.tags.url + "?tag=django"):
+            response = self.client.get(url)
+            self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(self.client.get(self.blog.url), "Updated intro")
+
+        post.unpublish()
+        self.assertEqual(self.client.get(post.url).status_code, 404)
+
+    def test_culled_version_keys_do_not_revive_purged_entries(self):
+        self.client.get(self.blog.url)
+        purge_pages([self.blog])
+        self.assertEqual(self.client.get(self.blog.url)["X-Page-Cache"], "MISS")
+        # The cache drops the path's version key, as a cull would
+        site_id, _root_url, path = self.blog.get_url_parts()
+        get_page_cache().delete(PATH_VERSION_KEY.format(site_id=site_id, path=path))
+        self.assertEqual(self.client.get(self.blog.url)["X-Page-Cache"], "MISS")
+
+    def test_authenticated_users_and_excluded_pages_bypass_the_cache(self):
+        exam_type = ExamType.objects.create(code="EX", name="Exam")
+        ExamQuestion.objects.create(
+            exam_type=exam_type, question_text="Question", options={"A": "Yes"}, answers=["A"],
+        )
+        exam = self.home.add_child(instance=MockExamPage(
+            title="Exam", slug="exam", exam_type=exam_type,
+        ))
+        self.client.get(exam.url)
+        self.assertNotIn("X-Page-Cache", self.client.get(exam.url))
+
+        post = self.make_post(self.blog, "Post", tags=["django"])
+        self.client.get(post.url)
+        self.client.force_login(User.objects.create_user("editor"))
+        self.assertNotIn("X-Page-Cache", self.client.get(post.url))
+
+    @override_settings(PAGE_CACHE_ENABLED=False)
+    def test_disabled_by_default(self):
+        post = self.make_post(self.blog, "Post", tags=["django"])
+        self.client.get(post.url)
+        self.assertNotIn("X-Page-Cache", self.client.get(post.url))
+
+
+class FileBasedCacheTests(SimpleTestCase):
+    """
+    Tests for the file cache that culls at most once per interval.
+    """
+
+    def make_cache(self, **options):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        return FileBasedCache(location, {"OPTIONS": {"MAX_ENTRIES": 2, **options}})
+
+    def test_directory_is_listed_once_per_interval(self):
+        file_cache = self.make_cache(CULL_INTERVAL=60)
+        with mock.patch.object(
+            file_cache, "_list_cache_files", wraps=file_cache._list_cache_files
+        ) as listed:
+            for i in range(5):
+                file_cache.set(f"key{i}", i)
+        listed.assert_called_once()
+
+    def test_entries_are_culled_past_max_entries(self):
+        file_cache = self.make_cache(CULL_INTERVAL=0, CULL_FREQUENCY=0)
+        for i in range(3):
+            file_cache.set(f"key{i}", i)
+        self.assertEqual(len(file_cache._list_cache_files()), 1)
+
+
+class DeferredSessionStoreTests(TestCase):
+    """
+    Tests for the session engine deferring database writes.
+    """
+
+    def stored(self, session):
+        return Session.objects.get(session_key=session.session_key).get_decoded()
+
+    def test_deferred_saves_only_reach_the_cache(self):
+        session = SessionStore()
+        session["step"] = 1
+        session.save()
+
+        session = SessionStore(session.session_key)
+        session["step"] = 2
+        session.defer_db_write()
+        session.save()
+        self.assertEqual(SessionStore(session.session_key)["step"], 2)
+        self.assertEqual(self.stored(session)["step"], 1)
+
+        session = SessionStore(session.session_key)
+        session["step"] = 3
+        session.save()
+        self.assertEqual(self.stored(session)["step"], 3)
+
+    @override_settings(CACHES={
+        **settings.CACHES,
+        "sessions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    })
+    def test_saves_are_not_deferred_to_a_per_process_cache(self):
+        session = SessionStore()
+        session["step"] = 1
+        session.save()
+
+        session = SessionStore(session.session_key)
+        session["step"] = 2
+        session.defer_db_write()
+        session.save()
+        self.assertEqual(self.stored(session)["step"], 2)
@@ -0,0 +1,8 @@
+from wagtail import hooks
+
+
+@hooks.register("before_serve_page")
+def mark_page_for_cache(page, request, serve_args, serve_kwargs):
+    # Tells AnonymousPageCacheMiddleware the response is a served page.
+    # Previews do not go through this hook.
+    request.page_cache_page = page
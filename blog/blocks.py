@@ -1,3 +1,4 @@
+from django.utils.html import strip_tags
 from wagtail.blocks import (
     ChoiceBlock,
     StructBlock,
@@ -6,6 +7,20 @@ from wagtail.blocks import (
     CharBlock
 )
 
+from base.search_text import CODE, HEADINGS, TEXT
+from blog.highlighting import highlight_code
+
+
+class SectionHeadingBlock(CharBlock):
+    """A heading between sections of a post."""
+
+    def get_search_text(self, value):
+        return {HEADINGS: [value]}
+
+    class Meta:
+        icon = "title"
+
+
 class CodeBlock(StructBlock):
     language = ChoiceBlock(
         choices=[
@@ -21,6 +36,15 @@ class CodeBlock(StructBlock):
     )
     code = TextBlock(help_text="Paste your code snippet here.")
 
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        context["highlighted_code"] = highlight_code(value["language"], value["code"])
+        return context
+
+    def get_search_text(self, value):
+        # Not the language choice: every Python snippet would match "python"
+        return {CODE: [value["code"]]}
+
     class Meta:
         template = "blog/blocks/code_block.html"
         icon = "code"
@@ -30,6 +54,9 @@ class NoteBlock(StructBlock):
     title = CharBlock(required=False, help_text="Optional title for the note")
     body = RichTextBlock(features=["bold", "italic", "link", "ul", "ol"])
 
+    def get_search_text(self, value):
+        return {HEADINGS: [value["title"]], TEXT: [strip_tags(value["body"].source)]}
+
     class Meta:
         icon = "help"
         label = "Note"
@@ -0,0 +1,41 @@
+import hashlib
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
+
+HIGHLIGHT_CACHE_KEY = "blog:highlight:{digest}"
+HIGHLIGHT_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+# Only the token spans are emitted; code_block.html provides <pre><code>.
+# blog/static/blog/css/code.css holds the matching "github-dark" styles.
+FORMATTER = HtmlFormatter(nowrap=True)
+
+
+def _render(language, code):
+    try:
+        lexer = get_lexer_by_name(language)
+    except ClassNotFound:
+        return escape(code)
+    # Pygments always ends the output with a newline
+    return highlight(code, lexer, FORMATTER).removesuffix("\n")
+
+
+@lru_cache(maxsize=512)
+def highlight_code(language, code):
+    """Return highlighted HTML for a snippet.
+
+    Results are cached per process and in the shared cache, keyed by a hash
+    of ``(language, code)``, so each snippet is tokenized once.
+    """
+    digest = hashlib.sha256(f"{language}\0{code}".encode()).hexdigest()
+    html = cache.get_or_set(
+        HIGHLIGHT_CACHE_KEY.format(digest=digest),
+        lambda: _render(language, code),
+        HIGHLIGHT_CACHE_TIMEOUT,
+    )
+    return mark_safe(html)
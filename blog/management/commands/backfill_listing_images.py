@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from blog.models import BlogPage, BlogPageGalleryImage
+
+
+class Command(BaseCommand):
+    help = "Set BlogPage.listing_image to the first gallery image of every post."
+
+    def handle(self, *args, **options):
+        first_image = (
+            BlogPageGalleryImage.objects.filter(page_id=OuterRef('pk'))
+            .order_by('sort_order', 'pk')
+            .values('image_id')[:1]
+        )
+        updated = BlogPage.objects.update(listing_image_id=Subquery(first_image))
+        self.stdout.write(self.style.SUCCESS(f"Updated the listing image of {updated} posts."))
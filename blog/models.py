@@ -1,11 +1,16 @@
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
 from django import forms
+from django.utils.functional import cached_property
 from modelcluster.fields import ParentalKey, ParentalManyToManyField
 from modelcluster.fields import ParentalKey
 from wagtail.models import Page, Orderable
 from wagtail.fields import RichTextField
 from wagtail.admin.panels import FieldPanel,MultiFieldPanel
 from wagtail.snippets.models import register_snippet
+from wagtail.images import get_image_model
 
 from modelcluster.contrib.taggit import ClusterTaggableManager
 from taggit.models import TaggedItemBase
@@ -15,24 +20,55 @@ from wagtail.search import index
 from wagtail.fields import StreamField
 from wagtail.models import Page
 from wagtail.admin.panels import FieldPanel
-from blog.blocks import CodeBlock,NoteBlock
+from base.conditional import ConditionalGetMixin
+from base.search_text import CODE, HEADINGS, TEXT, stream_search_text
+from blog.blocks import CodeBlock, NoteBlock, SectionHeadingBlock
+from blog.tag_listing import get_tag_page, get_tag_post_count, resolve_tag
 
 from wagtail.blocks import (
-    CharBlock,
     RichTextBlock,
 
 )
 
-class BlogIndexPage(Page):
+class BlogIndexPage(ConditionalGetMixin, Page):
     intro = RichTextField(blank=True)
+    posts_per_page = 10
+    # Rendition used for post thumbnails in blog_index_page.html
+    listing_image_filter = "fill-160x100"
+
     # add the get_context method:
     def get_context(self, request):
         # Update context to include only published posts, ordered by reverse-chron
         context = super().get_context(request)
-        blogpages = self.get_children().live().order_by('-first_published_at')
+        blogpages = (
+            BlogPage.objects.child_of(self).live()
+            .select_related('listing_image')
+            .order_by('-first_published_at')
+        )
+        paginator = Paginator(blogpages, self.posts_per_page)
+        blogpages = paginator.get_page(request.GET.get('page'))
+        prefetch_listing_renditions(blogpages.object_list, self.listing_image_filter)
         context['blogpages'] = blogpages
         return context
 
+
+def prefetch_listing_renditions(posts, *filter_specs):
+    """Prefetch the ``filter_specs`` renditions of the listing images of
+    posts fetched with ``select_related('listing_image')``, so
+    ``{% image %}`` makes no further queries."""
+    images = [post.listing_image for post in posts if post.listing_image_id]
+    prefetch_related_objects(
+        images,
+        Prefetch(
+            'renditions',
+            queryset=get_image_model().get_rendition_model().objects.filter(
+                filter_spec__in=filter_specs
+            ),
+            to_attr='prefetched_renditions',
+        ),
+    )
+
+
 class BlogPageTag(TaggedItemBase):
     content_object = ParentalKey(
         'BlogPage',
@@ -40,12 +76,17 @@ class BlogPageTag(TaggedItemBase):
         on_delete=models.CASCADE
     )
 
-class BlogPage(Page):
+    class Meta:
+        indexes = [
+            models.Index(fields=['tag', 'content_object'], name='blog_tag_post_idx'),
+        ]
+
+class BlogPage(ConditionalGetMixin, Page):
     date = models.DateField("Post date")
     intro = models.CharField(max_length=250)
     # body = RichTextField(blank=True)
     body = StreamField([
-        ('heading', CharBlock()),
+        ('heading', SectionHeadingBlock()),
         ('paragraph', RichTextBlock()),
         ('code', CodeBlock()),
         ("note", NoteBlock()),
@@ -54,12 +95,35 @@ class BlogPage(Page):
     # Add this:
     authors = ParentalManyToManyField('blog.Author', blank=True)
     tags = ClusterTaggableManager(through=BlogPageTag, blank=True)
+    # First gallery image, denormalized so listings can select_related it.
+    # Kept in sync by save(); see the backfill_listing_images command.
+    listing_image = models.ForeignKey(
+        'wagtailimages.Image', null=True, blank=True, editable=False,
+        on_delete=models.SET_NULL, related_name='+'
+    )
+
     def main_image(self):
-        gallery_item = self.gallery_images.first()
-        if gallery_item:
-            return gallery_item.image
-        else:
-            return None
+        return self.listing_image
+
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        # Draft revisions only save revision bookkeeping fields; the gallery
+        # that counts is the one committed to the database.
+        if update_fields is None or 'gallery_images' in update_fields:
+            self.sync_listing_image()
+        return result
+
+    def sync_listing_image(self):
+        image_id = (
+            BlogPageGalleryImage.objects.filter(page_id=self.pk)
+            .values_list('image_id', flat=True)
+            .first()
+        )
+        if image_id != self.listing_image_id:
+            self.listing_image_id = image_id
+            BlogPage.objects.filter(pk=self.pk).update(listing_image_id=image_id)
+
     content_panels = Page.content_panels + [
         MultiFieldPanel([
             "date",
@@ -70,10 +134,29 @@ class BlogPage(Page):
         ], heading="Blog information"),
             "intro", "body", "gallery_images"
     ]
+    # The body is indexed through stream_search_text(): headings boosted,
+    # code in its own field when SEARCH_INDEX_CODE is set, block structure
+    # and choice labels left out.
     search_fields = Page.search_fields + [
         index.SearchField('intro'),
-        index.SearchField('body'),
+        index.SearchField('get_body_headings', boost=2),
+        index.SearchField('get_body_text'),
     ]
+    if getattr(settings, 'SEARCH_INDEX_CODE', False):
+        search_fields.append(index.SearchField('get_body_code', boost=0.5))
+
+    @cached_property
+    def body_search_text(self):
+        return stream_search_text(self.body)
+
+    def get_body_headings(self):
+        return self.body_search_text.get(HEADINGS, '')
+
+    def get_body_text(self):
+        return self.body_search_text.get(TEXT, '')
+
+    def get_body_code(self):
+        return self.body_search_text.get(CODE, '')
 
 
 
@@ -81,16 +164,25 @@ class BlogPage(Page):
     
 
 class BlogTagIndexPage(Page):
+    posts_per_page = 20
 
     def get_context(self, request):
 
         # Filter by tag
-        tag = request.GET.get('tag')
-        blogpages = BlogPage.objects.filter(tags__name=tag)
+        tag = resolve_tag(request.GET.get('tag'))
+        blogpages, next_cursor, post_count = [], None, 0
+        if tag:
+            blogpages, next_cursor = get_tag_page(
+                tag, request.GET.get('after'), self.posts_per_page
+            )
+            post_count = get_tag_post_count(tag)
 
         # Update template context
         context = super().get_context(request)
+        context['tag'] = tag
         context['blogpages'] = blogpages
+        context['next_cursor'] = next_cursor
+        context['post_count'] = post_count
         return context
 
 class BlogPageGalleryImage(Orderable):
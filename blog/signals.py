@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from wagtail.signals import page_published, page_unpublished
+
+from blog.models import BlogPage
+from blog.tag_listing import invalidate_tag_counts
+
+
+@receiver(page_published, sender=BlogPage)
+@receiver(page_unpublished, sender=BlogPage)
+@receiver(post_delete, sender=BlogPage)
+def blog_page_changed(sender, instance, **kwargs):
+    invalidate_tag_counts()
@@ -0,0 +1,12 @@
+function copyCode(button) {
+  const code = button.closest('.code-block').querySelector('code').innerText;
+  navigator.clipboard.writeText(code);
+
+  button.textContent = 'Copied!';
+  button.classList.add('copied');
+
+  setTimeout(() => {
+    button.textContent = 'Copy';
+    button.classList.remove('copied');
+  }, 2000);
+}
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db.models import DateTimeField, Q, Value
+from django.db.models.functions import Coalesce
+from taggit.models import Tag
+
+from base.cache import bump_version, get_version
+
+# Bumped whenever a post is published, unpublished or deleted; cached tag
+# counts are keyed on it so they never outlive a change.
+VERSION_KEY = "blog:tag_listing_version"
+COUNT_KEY = "blog:tag_count:{tag_id}:{version}"
+COUNT_TIMEOUT = 60 * 60 * 24
+
+
+def resolve_tag(value):
+    """Return the tag for a ``?tag=`` value, matched on slug then name."""
+    if not value:
+        return None
+    tags = {tag.slug == value: tag for tag in Tag.objects.filter(Q(slug=value) | Q(name=value))}
+    return tags.get(True) or tags.get(False)
+
+
+def tagged_posts(tag):
+    from blog.models import BlogPage
+
+    return BlogPage.objects.live().filter(tagged_items__tag=tag)
+
+
+def invalidate_tag_counts():
+    bump_version(VERSION_KEY)
+
+
+def get_tag_post_count(tag):
+    key = COUNT_KEY.format(tag_id=tag.pk, version=get_version(VERSION_KEY))
+    return cache.get_or_set(key, lambda: tagged_posts(tag).count(), COUNT_TIMEOUT)
+
+
+# Posts saved live without a revision have no publish dates; they sort as
+# the oldest, by pk, so every post has a position in the listing.
+UNDATED = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(post):
+    return f"{post.listing_date.isoformat()}~{post.pk}"
+
+
+def decode_cursor(cursor):
+    try:
+        published, pk = cursor.rsplit("~", 1)
+        return datetime.fromisoformat(published), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def get_tag_page(tag, cursor=None, per_page=20):
+    """Return ``(posts, next_cursor)`` for the posts tagged ``tag``, newest
+    first, starting after ``cursor``.
+
+    Keyset pagination on ``(publish date, pk)`` keeps every page a single
+    range scan, however deep the reader goes. Posts without a first publish
+    date fall back to their latest revision, then to ``UNDATED``.
+    """
+    posts = tagged_posts(tag).annotate(
+        listing_date=Coalesce(
+            "first_published_at", "latest_revision_created_at", Value(UNDATED),
+            output_field=DateTimeField(),
+        )
+    ).order_by("-listing_date", "-pk")
+    position = decode_cursor(cursor)
+    if position:
+        published, pk = position
+        posts = posts.filter(
+            Q(listing_date__lt=published) | Q(listing_date=published, pk__lt=pk)
+        )
+    posts = list(posts[:per_page + 1])
+    next_cursor = encode_cursor(posts[per_page - 1]) if len(posts) > per_page else None
+    return posts[:per_page], next_cursor
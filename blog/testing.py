@@ -0,0 +1,38 @@
+import datetime
+
+from wagtail.images import get_image_model
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from blog.models import BlogIndexPage, BlogPage, BlogPageGalleryImage
+
+
+class BlogTestMixin:
+    """
+    Helpers to build a blog index with posts under the default site, for
+    ``TestCase`` classes of any app.
+    """
+
+    def make_index(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        return root.add_child(instance=BlogIndexPage(title="Blog", slug="blog"))
+
+    def make_post(self, index, title, image=None, tags=(), intro=None, body=None):
+        post = BlogPage(
+            title=title,
+            date=datetime.date(2025, 1, 1),
+            intro=f"Intro of {title}" if intro is None else intro,
+            body=[("paragraph", "<p>Hello</p>")] if body is None else body,
+        )
+        if image is not None:
+            post.gallery_images = [BlogPageGalleryImage(image=image)]
+        for tag in tags:
+            post.tags.add(tag)
+        # The reference and search indexes are updated on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            index.add_child(instance=post)
+            post.save_revision().publish()
+        return post
+
+    def make_image(self):
+        return get_image_model().objects.create(title="Image", file=get_test_image_file())
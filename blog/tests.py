@@ -1,3 +1,209 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from wagtail.models import Site
+
+from blog import highlighting
+from blog.blocks import CodeBlock
+from blog.models import BlogIndexPage, BlogPage, BlogTagIndexPage
+from blog.testing import BlogTestMixin
+
+
+class BlogIndexPageTests(BlogTestMixin, TestCase):
+    def setUp(self):
+        self.index = self.make_index()
+        self.image = self.make_image()
+
+    def render_index(self, **params):
+        return self.client.get(self.index.url, params)
+
+    def test_index_is_paginated(self):
+        for i in range(BlogIndexPage.posts_per_page + 2):
+            self.make_post(self.index, f"Post {i}")
+        response = self.render_index()
+        self.assertEqual(len(response.context["blogpages"]), BlogIndexPage.posts_per_page)
+        response = self.render_index(page=2)
+        self.assertEqual(len(response.context["blogpages"]), 2)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for i in range(2):
+            self.make_post(self.index, f"Post {i}", image=self.image)
+        self.render_index()  # create the renditions
+        with CaptureQueriesContext(connection) as small:
+            self.render_index()
+        for i in range(2, 8):
+            self.make_post(self.index, f"Post {i}", image=self.image)
+        self.render_index()
+        with CaptureQueriesContext(connection) as large:
+            self.render_index()
+        self.assertEqual(len(small), len(large))
+
+
+class ListingImageTests(BlogTestMixin, TestCase):
+    def setUp(self):
+        self.index = self.make_index()
+        self.image = self.make_image()
+
+    def test_listing_image_follows_published_gallery(self):
+        post = self.make_post(self.index, "Post", image=self.image)
+        self.assertEqual(BlogPage.objects.get(pk=post.pk).listing_image, self.image)
+
+        post.gallery_images = []
+        post.save_revision()
+        self.assertEqual(BlogPage.objects.get(pk=post.pk).listing_image, self.image)
+
+        post.get_latest_revision().publish()
+        self.assertIsNone(BlogPage.objects.get(pk=post.pk).listing_image)
+
+    def test_backfill_command(self):
+        post = self.make_post(self.index, "Post", image=self.image)
+        BlogPage.objects.filter(pk=post.pk).update(listing_image=None)
+        call_command("backfill_listing_images", stdout=StringIO())
+        self.assertEqual(BlogPage.objects.get(pk=post.pk).listing_image, self.image)
+
+
+class BlogTagIndexPageTests(BlogTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.index = self.make_index()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.tags_page = root.add_child(instance=BlogTagIndexPage(title="Tags", slug="tags"))
+
+    def test_keyset_pagination_walks_all_tagged_posts(self):
+        BlogTagIndexPage.posts_per_page = 3
+        self.addCleanup(setattr, BlogTagIndexPage, "posts_per_page", 20)
+        posts = [self.make_post(self.index, f"Post {i}", tags=["Wagtail Tips"]) for i in range(7)]
+        self.make_post(self.index, "Untagged")
+
+        seen, params = [], {"tag": "wagtail-tips"}
+        while True:
+            response = self.client.get(self.tags_page.url, params)
+            self.assertEqual(response.context["post_count"], 7)
+            seen += [post.pk for post in response.context["blogpages"]]
+            if not response.context["next_cursor"]:
+                break
+            params["after"] = response.context["next_cursor"]
+        self.assertEqual(seen, [post.pk for post in reversed(posts)])
+
+    def test_keyset_pagination_walks_posts_without_publish_date(self):
+        BlogTagIndexPage.posts_per_page = 3
+        self.addCleanup(setattr, BlogTagIndexPage, "posts_per_page", 20)
+        dated = [self.make_post(self.index, f"Post {i}", tags=["django"]) for i in range(2)]
+        undated = []
+        for i in range(5):
+            # Saved live without a revision: no first_published_at
+            post = BlogPage(title=f"Undated {i}", date=datetime.date(2025, 1, 1), intro="Intro")
+            post.tags.add("django")
+            self.index.add_child(instance=post)
+            undated.append(post)
+        self.assertIsNone(undated[0].first_published_at)
+
+        seen, params = [], {"tag": "django"}
+        while True:
+            response = self.client.get(self.tags_page.url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [post.pk for post in response.context["blogpages"]]
+            if not response.context["next_cursor"]:
+                break
+            params["after"] = response.context["next_cursor"]
+        # Dated posts first, newest first, then undated ones by pk
+        self.assertEqual(seen, [post.pk for post in reversed(dated)] + [
+            post.pk for post in reversed(undated)
+        ])
+
+    def test_tag_count_refreshed_on_unpublish(self):
+        post = self.make_post(self.index, "Post", tags=["django"])
+        response = self.client.get(self.tags_page.url, {"tag": "django"})
+        self.assertEqual(response.context["post_count"], 1)
+        post.unpublish()
+        response = self.client.get(self.tags_page.url, {"tag": "django"})
+        self.assertEqual(response.context["post_count"], 0)
+
+
+class CodeBlockTests(BlogTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        highlighting.highlight_code.cache_clear()
+
+    def test_code_is_highlighted_once(self):
+        block = CodeBlock()
+        value = block.to_python({"language": "python", "code": "def f():\n    return '<b>'"})
+        with mock.patch.object(highlighting, "_render", wraps=highlighting._render) as render:
+            html = block.render(value)
+            block.render(value)
+            highlighting.highlight_code.cache_clear()
+            block.render(value)
+        self.assertEqual(render.call_count, 1)
+        self.assertIn('<span class="k">def</span>', html)
+        self.assertIn("&lt;b&gt;", html)
+
+    def test_copy_script_is_included_once_per_page(self):
+        index = self.make_index()
+        post = self.make_post(index, "Post")
+        post.body = [("code", {"language": "bash", "code": "ls"})] * 3
+        post.save_revision().publish()
+        html = self.client.get(post.url).content.decode()
+        self.assertEqual(html.count("code_block.js"), 1)
+        self.assertEqual(html.count("function copyCode"), 0)
+        self.assertNotIn("highlight.min.js", html)
+
+
+class ConditionalGetTests(BlogTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.index = self.make_index()
+        self.post = self.make_post(self.index, "Post")
+
+    def test_validators_short_circuit_rendering(self):
+        response = self.client.get(self.post.url)
+        self.assertTrue(response.has_header("Last-Modified"))
+        with mock.patch.object(BlogPage, "get_context") as get_context:
+            not_modified = self.client.get(self.post.url, HTTP_IF_NONE_MATCH=response["ETag"])
+            since = self.client.get(
+                self.post.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        get_context.assert_not_called()
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(since.status_code, 304)
+
+    def test_index_validators_change_when_a_post_is_published(self):
+        etag = self.client.get(self.index.url)["ETag"]
+        self.make_post(self.index, "Another post")
+        response = self.client.get(self.index.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class SearchTextTests(BlogTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.index = self.make_index()
+
+    def make_searchable_post(self):
+        return self.make_post(self.index, "Post", body=[
+            ("heading", "Zookeeper internals"),
+            ("paragraph", "<p>Leader <b>election</b> explained</p>"),
+            ("code", {"language": "python", "code": "quorum_size = 3"}),
+            ("note", {"title": "Caveat", "body": "<p>Sessions expire</p>"}),
+        ])
+
+    def test_body_is_split_into_weighted_fields(self):
+        post = BlogPage.objects.get(pk=self.make_searchable_post().pk)
+        self.assertEqual(post.get_body_headings(), "Zookeeper internals\nCaveat")
+        self.assertEqual(post.get_body_text(), "Leader election explained\nSessions expire")
+        self.assertEqual(post.get_body_code(), "quorum_size = 3")
 
-# Create your tests here.
+    def test_code_is_not_indexed_by_default(self):
+        post = self.make_searchable_post()
+        results = BlogPage.objects.live().search
+        self.assertEqual(list(results("zookeeper")), [post])
+        self.assertEqual(list(results("election")), [post])
+        self.assertEqual(list(results("quorum_size")), [])
+        self.assertEqual(list(results("python")), [])
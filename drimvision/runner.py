@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+from django.utils.module_loading import import_string
+
+
+class TestRunner(DiscoverRunner):
+    """Run the tests with file caches and media files of their own.
+
+    The file caches and MEDIA_ROOT are shared with the site running on the
+    same node, and would carry entries over from one run to the next. Each
+    run gets them in a temporary directory, removed afterwards.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.temp_dir = tempfile.mkdtemp(prefix="drimvision-tests-")
+        caches = {}
+        for alias, config in settings.CACHES.items():
+            if issubclass(import_string(config["BACKEND"]), FileBasedCache):
+                config = {**config, "LOCATION": os.path.join(self.temp_dir, "cache", alias)}
+            caches[alias] = config
+        self.isolated_settings = override_settings(
+            CACHES=caches, MEDIA_ROOT=os.path.join(self.temp_dir, "media")
+        )
+        self.isolated_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.isolated_settings.disable()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
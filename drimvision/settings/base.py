@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 import os
+import tempfile
 
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 BASE_DIR = os.path.dirname(PROJECT_DIR)
@@ -59,6 +60,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "base.middleware.AnonymousPageCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
@@ -96,9 +98,111 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        # Reuse connections across requests instead of reopening the file
+        # and re-running the pragmas below every time.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# SQLite tuning for concurrent exam takers, applied to every new connection.
+# Set SQLITE_TUNING=0 to compare against the defaults (see
+# quiz/tools/loadtest_exam.py).
+# - WAL lets readers run while a writer commits.
+# - synchronous=NORMAL is safe with WAL; only a power loss can drop the
+#   last commits.
+# - busy_timeout waits up to 5s for the write lock rather than failing with
+#   "database is locked"; IMMEDIATE transactions take that lock up front so
+#   a reader can't deadlock upgrading to a writer.
+# - mmap_size and cache_size (64 MB each) keep hot pages in memory.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+]
+if os.environ.get("SQLITE_TUNING", "1") == "1":
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": ";".join(SQLITE_PRAGMAS),
+        "transaction_mode": "IMMEDIATE",
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Caches that must agree between the worker processes of a node are kept in
+# files under CACHE_DIR, see base.cache.
+CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join(tempfile.gettempdir(), "drimvision-cache"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "base.cache.FileBasedCache",
+        "LOCATION": os.path.join(CACHE_DIR, "default"),
+        "OPTIONS": {
+            "MAX_ENTRIES": 5000,
+            "CULL_FREQUENCY": 3,
+        },
+    },
+    # Rendered StreamField HTML, see base.render_cache. Bounded in size: a
+    # random third of the entries is culled once MAX_ENTRIES is reached.
+    "renders": {
+        "BACKEND": "base.cache.FileBasedCache",
+        "LOCATION": os.path.join(CACHE_DIR, "renders"),
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {
+            "MAX_ENTRIES": 2000,
+            "CULL_FREQUENCY": 3,
+        },
+    },
+    # Sessions, see base.sessions. Files are shared by all the worker
+    # processes of a node; point SESSION_CACHE_DIR at a persistent directory.
+    # Every answer in an exam writes its session, so the directory is only
+    # checked for culling every CULL_INTERVAL seconds; a culled session is
+    # reloaded from the database as of the last exam start or submit, so
+    # cull few entries at a time, well above the number of active sessions.
+    "sessions": {
+        "BACKEND": "base.cache.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "SESSION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "drimvision-sessions")
+        ),
+        "TIMEOUT": 60 * 60 * 24 * 14,
+        "OPTIONS": {
+            "MAX_ENTRIES": 50000,
+            "CULL_FREQUENCY": 10,
+            "CULL_INTERVAL": 60 * 5,
+        },
+    },
+    # Anonymous full-page responses, see base.page_cache
+    "pages": {
+        "BACKEND": "base.cache.FileBasedCache",
+        "LOCATION": os.path.join(CACHE_DIR, "pages"),
+        "OPTIONS": {
+            "MAX_ENTRIES": 2000,
+            "CULL_FREQUENCY": 3,
+        },
+    },
+}
+
+STREAMFIELD_CACHE_ALIAS = "renders"
+
+# Cached database sessions; during an exam only the cache is written, the
+# database row at exam start and submit (see MockExamPage.serve).
+SESSION_ENGINE = "base.sessions"
+SESSION_CACHE_ALIAS = "sessions"
+
+# Full-page cache for anonymous readers, see base.page_cache. Entries are
+# purged on publish, so the timeout only bounds how long an unrelated change
+# (e.g. a new tag on another post) may take to show up.
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "") == "1"
+PAGE_CACHE_ALIAS = "pages"
+PAGE_CACHE_TIMEOUT = 60 * 5
+# Only these query parameters change a page's content; others are ignored
+PAGE_CACHE_QUERY_PARAMS = ["page", "tag", "after"]
+PAGE_CACHE_EXCLUDED_PAGE_TYPES = ["quiz.MockExamPage", "base.FormPage"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -174,9 +278,31 @@ WAGTAIL_SITE_NAME = "drimvision"
 WAGTAILSEARCH_BACKENDS = {
     "default": {
         "BACKEND": "wagtail.search.backends.database",
+        # Updates go through search.index_queue instead
+        "AUTO_UPDATE": False,
     }
 }
 
+# Index updates are deduplicated and written in batches, see
+# search.index_queue; in production from a background thread (the dev
+# server and tests write them on commit). Objects changed while no worker
+# was running are reindexed by `manage.py reindex_changed`.
+SEARCH_INDEX_BACKGROUND = False
+SEARCH_INDEX_QUEUE_DELAY = 2
+SEARCH_INDEX_BATCH_SIZE = 100
+
+# Index the code blocks of blog posts, as a separate low-weight field
+SEARCH_INDEX_CODE = False
+
+# Search result ids are cached per normalized query, see search.services.
+# Only the best SEARCH_MAX_RESULTS matches are kept; the results page then
+# reports "500+ results".
+SEARCH_MAX_RESULTS = 500
+SEARCH_RESULTS_CACHE_TIMEOUT = 60 * 10
+
+# Tests run with their own file caches and MEDIA_ROOT, see drimvision.runner
+TEST_RUNNER = "drimvision.runner.TestRunner"
+
 # Base URL to use when referring to full URLs within the Wagtail admin backend -
 # e.g. in notification emails. Don't include '/admin' or a trailing slash
 WAGTAILADMIN_BASE_URL = "http://example.com"
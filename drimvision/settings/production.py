@@ -8,6 +8,9 @@ DEBUG = False
 # See https://docs.djangoproject.com/en/5.2/ref/contrib/staticfiles/#manifeststaticfilesstorage
 STORAGES["staticfiles"]["BACKEND"] = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
 
+# Publishing doesn't wait for search index writes
+SEARCH_INDEX_BACKGROUND = True
+
 try:
     from .local import *
 except ImportError:
@@ -0,0 +1,67 @@
+"""Gunicorn configuration for drimvision.
+
+    gunicorn -c gunicorn.conf.py
+
+Every setting can be overridden from the environment:
+
+    GUNICORN_WORKERS              worker processes (default: 2 x CPUs + 1)
+    GUNICORN_THREADS              threads per worker (default: 2)
+    GUNICORN_TIMEOUT              seconds before a silent worker is restarted (30)
+    GUNICORN_MAX_REQUESTS         requests before a worker is recycled (1000)
+    GUNICORN_MAX_REQUESTS_JITTER  random extra requests, so workers don't
+                                  all restart at once (100)
+    GUNICORN_PRELOAD              load the app before forking (1)
+    PORT                          port to bind on all interfaces (8000)
+"""
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+wsgi_app = "drimvision.wsgi:application"
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = env_int("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+# More than one thread switches the worker class to gthread; threads mostly
+# wait on SQLite and the disk, so two per worker is cheap concurrency.
+threads = env_int("GUNICORN_THREADS", 2)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = timeout
+keepalive = 5
+
+# Recycle workers to bound slow memory growth (e.g. per-process caches)
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# Import Django, Wagtail, the models and the URLconf once in the master;
+# workers share those pages copy-on-write and start serving immediately.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# The heartbeat file is touched on every request; keep it off the disk
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    # Resolve the URLconf and compile the base template before forking
+    get_resolver().url_patterns
+    get_template("base.html")
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading must not be shared with workers
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
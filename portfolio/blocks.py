@@ -1,5 +1,7 @@
 from base.blocks import BaseStreamBlock
 
+from wagtail.models import Page
+
 # import ImageBlock:
 from wagtail.images.blocks import ImageBlock
 
@@ -16,6 +18,21 @@ from wagtail.blocks import (
 
 
 
+def resolve_specific_pages(pages):
+    """Return the specific instances of ``pages`` in the same order, with
+    one query for those not already specific. Deleted pages are dropped."""
+    pages = [page for page in pages if page is not None]
+    generic_ids = [page.pk for page in pages if type(page) is Page]
+    specific = {}
+    if generic_ids:
+        specific = {page.pk: page for page in Page.objects.filter(pk__in=generic_ids).specific()}
+    return [
+        specific.get(page.pk) if type(page) is Page else page
+        for page in pages
+        if type(page) is not Page or page.pk in specific
+    ]
+
+
 # add CardBlock:
 class CardBlock(StructBlock):
     heading = CharBlock()
@@ -32,6 +49,15 @@ class FeaturedPostsBlock(StructBlock):
     text = RichTextBlock(features=["bold", "italic", "link"], required=False)
     posts = ListBlock(PageChooserBlock(page_type="blog.BlogPage"))
 
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        request = (parent_context or {}).get("request")
+        context["featured_posts"] = [
+            (page, page.get_url(request=request))
+            for page in resolve_specific_pages(value["posts"])
+        ]
+        return context
+
     class Meta:
         icon = "folder-open-inverse"
         template = "portfolio/blocks/featured_posts_block.html"
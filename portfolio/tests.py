@@ -1,3 +1,71 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from wagtail.models import Site
+
+from base.render_cache import get_render_cache
+from blog.testing import BlogTestMixin
+from portfolio.blocks import FeaturedPostsBlock
+from portfolio.models import PortfolioPage
+
+
+class PortfolioTestMixin(BlogTestMixin):
+    """
+    Helpers to build a portfolio page featuring blog posts.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_render_cache().clear()
+        self.blog = self.make_index()
+        self.home = Site.objects.get(is_default_site=True).root_page
+
+    def make_portfolio(self, posts):
+        portfolio = PortfolioPage(
+            title="Portfolio",
+            slug="portfolio",
+            body=[("featured_posts", {"heading": "Featured", "text": "", "posts": posts})],
+        )
+        # The reference index is updated by a task enqueued on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.home.add_child(instance=portfolio)
+            portfolio.save_revision().publish()
+        return PortfolioPage.objects.get(pk=portfolio.pk)
+
+
+class StreamFieldRenderCacheTests(PortfolioTestMixin, TestCase):
+    def test_body_is_cached_per_live_revision(self):
+        portfolio = self.make_portfolio([self.make_post(self.blog, "First post")])
+        self.client.get(portfolio.url)
+        key = f"streamfield:{portfolio.pk}:{portfolio.live_revision_id}:body"
+        self.assertIn("First post", get_render_cache().get(key))
+
+    def test_referenced_page_changes_invalidate_body(self):
+        post = self.make_post(self.blog, "First post")
+        portfolio = self.make_portfolio([post])
+        self.assertContains(self.client.get(portfolio.url), "First post")
+
+        post.title = "Renamed post"
+        post.save_revision().publish()
+        self.assertContains(self.client.get(portfolio.url), "Renamed post")
+
+
+class FeaturedPostsBlockTests(PortfolioTestMixin, TestCase):
+    def render_block(self, posts):
+        block = FeaturedPostsBlock()
+        value = block.to_python({"heading": "Featured", "text": "", "posts": [p.pk for p in posts]})
+        request = RequestFactory().get("/", SERVER_NAME="localhost")
+        with CaptureQueriesContext(connection) as queries:
+            html = block.render(value, context={"request": request})
+        return html, len(queries)
+
+    def test_posts_keep_order_with_constant_queries(self):
+        posts = [self.make_post(self.blog, f"Post {i}") for i in range(30)]
+        self.render_block(posts[:1])  # warm the site root paths cache
+        html, few_queries = self.render_block(posts[:3])
+        html, many_queries = self.render_block(list(reversed(posts)))
+        self.assertEqual(few_queries, many_queries)
+        self.assertLess(html.index("Post 29"), html.index("Post 0<"))
+        self.assertIn(f'href="{posts[0].url}"', html)
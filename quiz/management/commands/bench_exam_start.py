@@ -0,0 +1,84 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from quiz.models import ExamQuestion, ExamType
+from quiz.question_bank import invalidate_question_ids, sample_questions
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure exam-start question sampling latency for growing bank sizes. "
+        "Questions are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="100,1000,5000,10000",
+            help="Comma separated bank sizes to measure.",
+        )
+        parser.add_argument("--count", type=int, default=40, help="Questions per exam.")
+        parser.add_argument("--repeat", type=int, default=20, help="Exam starts per size.")
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        self.stdout.write(
+            f"{'bank size':>10} {'full load ms':>13} {'cold ids ms':>12} {'warm ids ms':>12}"
+        )
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    row = self.measure(size, options["count"], options["repeat"])
+                    raise _Rollback
+            except _Rollback:
+                pass
+            self.stdout.write(
+                f"{size:>10} {row[0]:>13.2f} {row[1]:>12.2f} {row[2]:>12.2f}"
+            )
+
+    def measure(self, size, count, repeat):
+        exam_type = ExamType.objects.create(code=f"bench-{size}", name=f"Bench {size}")
+        options = {label: f"Option {label} " * 10 for label in "ABCD"}
+        ExamQuestion.objects.bulk_create(
+            [
+                ExamQuestion(
+                    exam_type=exam_type,
+                    question_text=f"Benchmark question {i} " * 20,
+                    options=options,
+                    answers=["A"],
+                    explanation="Explanation " * 50,
+                )
+                for i in range(size)
+            ],
+            batch_size=1000,
+        )
+
+        def full_load():
+            qs = exam_type.questions.all()
+            total = qs.count()
+            return random.sample(list(qs), min(count, total))
+
+        def cold():
+            invalidate_question_ids(exam_type.id)
+            return sample_questions(exam_type.id, count)
+
+        def warm():
+            return sample_questions(exam_type.id, count)
+
+        warm()
+        row = tuple(self.time_ms(fn, repeat) for fn in (full_load, cold, warm))
+        invalidate_question_ids(exam_type.id)
+        return row
+
+    @staticmethod
+    def time_ms(fn, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,138 @@
+import json
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from quiz.models import ExamQuestion, ExamType
+from quiz.question_bank import clear_question_data, invalidate_question_ids
+
+UPDATE_FIELDS = ["module", "question_text", "options", "answers", "points", "explanation"]
+
+
+def iter_jsonl(stream):
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CommandError(f"Line {line_number}: {e}") from e
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Yield the items of a top-level JSON array without loading it whole."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise CommandError("Expected a JSON array of questions.")
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise CommandError("Truncated or invalid JSON array.")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a question bank from JSON or JSONL. Questions are upserted on "
+        "their external question id, so re-running an import updates them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON array or JSONL file of questions.")
+        parser.add_argument("--exam-type", required=True, help="Exam type code, e.g. tta.")
+        parser.add_argument("--exam-name", help="Name used when creating the exam type.")
+        parser.add_argument("--format", choices=["json", "jsonl"], help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        code = options["exam_type"]
+        exam_type, _ = ExamType.objects.get_or_create(
+            code=code, defaults={"name": options["exam_name"] or code.upper()}
+        )
+        fmt = options["format"] or ("jsonl" if options["path"].endswith(".jsonl") else "json")
+
+        started = time.perf_counter()
+        imported = 0
+        with open(options["path"], encoding="utf-8") as f:
+            records = iter_jsonl(f) if fmt == "jsonl" else iter_json_array(f)
+            questions = (self.build_question(exam_type, r) for r in records)
+            while batch := list(islice(questions, options["batch_size"])):
+                # A row may only be upserted once per statement; the last one wins
+                batch = list({q.external_id: q for q in batch}.values())
+                with transaction.atomic():
+                    self.adopt_questions_without_id(exam_type, batch)
+                    ExamQuestion.objects.bulk_create(
+                        batch,
+                        update_conflicts=True,
+                        unique_fields=["exam_type", "external_id"],
+                        update_fields=UPDATE_FIELDS,
+                    )
+                imported += len(batch)
+
+        # Both go through the shared cache, so every worker sees the import
+        invalidate_question_ids(exam_type.id)
+        clear_question_data()
+
+        elapsed = time.perf_counter() - started
+        rate = imported / elapsed if elapsed else imported
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} questions into {exam_type.name} "
+            f"in {elapsed:.2f}s ({rate:.0f} rows/s)."
+        ))
+
+    @staticmethod
+    def adopt_questions_without_id(exam_type, batch):
+        """Give the questions that have no external id yet (added by hand, or
+        before ids were imported) the id of the imported question with the
+        same text, so that the upsert updates them instead of adding copies.
+        """
+        ids_by_text = {question.question_text: question.external_id for question in batch}
+        taken = set(
+            ExamQuestion.objects.filter(
+                exam_type=exam_type, external_id__in=ids_by_text.values()
+            ).values_list("external_id", flat=True)
+        )
+        adopted = []
+        unnumbered = ExamQuestion.objects.filter(
+            exam_type=exam_type, external_id__isnull=True, question_text__in=ids_by_text
+        ).order_by("pk").only("pk", "question_text")
+        for question in unnumbered:
+            external_id = ids_by_text[question.question_text]
+            if external_id not in taken:
+                question.external_id = external_id
+                taken.add(external_id)
+                adopted.append(question)
+        ExamQuestion.objects.bulk_update(adopted, ["external_id"])
+
+    @staticmethod
+    def build_question(exam_type, record):
+        try:
+            external_id = str(record["question_id"])
+            return ExamQuestion(
+                exam_type=exam_type,
+                external_id=external_id,
+                module=record.get("module") or "",
+                question_text=record["question_text"],
+                options=record["options"],
+                answers=record["answers"],
+                points=record.get("points", 1),
+                explanation=record.get("explanation", ""),
+            )
+        except KeyError as e:
+            raise CommandError(f"Question record is missing {e}: {record!r:.200}") from e
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from quiz.models import ExamAttempt, ExamQuestion
+from quiz.scoring import POLICIES, get_default_policy, score_attempts
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-score finished exam attempts against the current answer keys, "
+        "e.g. after an answer-key correction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam-type", help="Only regrade attempts for this exam type code.")
+        parser.add_argument("--policy", choices=POLICIES, help="Scoring policy to apply.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        policy = options["policy"] or get_default_policy()
+        attempts = ExamAttempt.objects.filter(finished_at__isnull=False)
+        questions = ExamQuestion.objects.all()
+        if options["exam_type"]:
+            attempts = attempts.filter(exam_type__code=options["exam_type"])
+            questions = questions.filter(exam_type__code=options["exam_type"])
+            if not questions.exists():
+                raise CommandError(f"No questions for exam type {options['exam_type']!r}")
+
+        answer_keys = {
+            pk: (answers, points)
+            for pk, answers, points in questions.values_list("pk", "answers", "points")
+        }
+
+        started = time.perf_counter()
+        regraded = 0
+        batch = []
+        rows = attempts.order_by("pk").values_list("pk", "question_ids", "submitted_answers")
+        for row in rows.iterator(chunk_size=options["batch_size"]):
+            batch.append(row)
+            if len(batch) >= options["batch_size"]:
+                regraded += self.regrade(batch, answer_keys, policy)
+                batch = []
+        if batch:
+            regraded += self.regrade(batch, answer_keys, policy)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Regraded {regraded} attempts with {policy!r} in {elapsed:.2f}s."
+        ))
+
+    def regrade(self, batch, answer_keys, policy):
+        earned, total = score_attempts(
+            [(ids, answers) for _, ids, answers in batch], answer_keys, policy
+        )
+        updated = [
+            ExamAttempt(pk=pk, earned_points=float(e), total_points=int(t))
+            for (pk, _, _), e, t in zip(batch, earned, total)
+        ]
+        with transaction.atomic():
+            ExamAttempt.objects.bulk_update(updated, ["earned_points", "total_points"])
+        return len(updated)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0003_alter_examquestion_answers_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamAttempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_ids', models.JSONField(default=list)),
+                ('submitted_answers', models.JSONField(default=dict)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('exam_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='quiz.examtype')),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='quiz.mockexampage')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0004_examattempt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examattempt',
+            name='earned_points',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='examattempt',
+            name='total_points',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0005_examattempt_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examquestion',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='examquestion',
+            constraint=models.UniqueConstraint(fields=('exam_type', 'external_id'), name='unique_question_external_id'),
+        ),
+    ]
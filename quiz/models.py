@@ -1,11 +1,13 @@
-from types import SimpleNamespace
 from django.db import models
 from django.shortcuts import redirect, render
+from django.utils import timezone
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.snippets.models import register_snippet
 from wagtail.models import Page
-import random
 import time
+
+from quiz.question_bank import AttemptQuestions, sample_questions
+from quiz.scoring import as_points, label_mask, score_attempt
 # --- ExamType remains the same ---
 @register_snippet
 class ExamType(models.Model):
@@ -30,6 +32,8 @@ class ExamQuestion(models.Model):
     exam_type = models.ForeignKey(
         ExamType, on_delete=models.CASCADE, related_name="questions"
     )
+    # Stable id from the source exam (e.g. "12" or "X1"), used to upsert imports
+    external_id = models.CharField(max_length=50, blank=True, null=True)
     module = models.CharField(max_length=100, blank=True)
     question_text = models.TextField(help_text="The main question text.")
 
@@ -51,6 +55,7 @@ class ExamQuestion(models.Model):
 
     panels = [
         FieldPanel("exam_type"),
+        FieldPanel("external_id"),
         FieldPanel("module"),
         FieldPanel("question_text"),
         FieldPanel("options"),
@@ -59,6 +64,13 @@ class ExamQuestion(models.Model):
         FieldPanel("explanation"),
     ]
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["exam_type", "external_id"], name="unique_question_external_id"
+            ),
+        ]
+
     def __str__(self):
         return f"[{self.exam_type.name}] {self.question_text[:80]}"
 
@@ -68,7 +80,7 @@ class ExamQuestion(models.Model):
 
     def is_correct(self, selected):
         """Compare list of selected labels with correct answers"""
-        return set(selected) == set(self.answers)
+        return label_mask(selected) == label_mask(self.answers)
 
 
 class MockExamPage(Page):
@@ -95,84 +107,68 @@ class MockExamPage(Page):
 
     def get_random_questions(self):
         settings = self.get_effective_settings()
-        qs = self.exam_type.questions.all()
-        total = qs.count()
-        if total == 0:
-            return []
-        return random.sample(list(qs), min(settings["question_count"], total))
+        return sample_questions(self.exam_type_id, settings["question_count"])
+
+    def get_current_attempt(self, request):
+        """Return the unfinished attempt referenced by the session, if any."""
+        attempt_id = request.session.get("exam_attempt_id")
+        if attempt_id is None:
+            return None
+        return ExamAttempt.objects.filter(
+            pk=attempt_id, exam_type_id=self.exam_type_id, finished_at__isnull=True
+        ).first()
+
+    def start_attempt(self, request):
+        questions = self.get_random_questions()
+        attempt = ExamAttempt.objects.create(
+            page=self,
+            exam_type_id=self.exam_type_id,
+            question_ids=[q.id for q in questions],
+        )
+        request.session["exam_attempt_id"] = attempt.id
+        request.session["exam_answers"] = {}
+        return attempt
 
     def serve(self, request):
         settings = self.get_effective_settings()
         max_duration = settings["duration_minutes"] * 60
 
-        # ✅ Initialize session ONCE per exam type
-        if (
-            "questions_data" not in request.session
-            or request.session.get("exam_type_id") != self.exam_type.id
-            or 'start_time' not in request.session
-        
-        ):
-            questions = self.get_random_questions()
-            request.session["exam_type_id"] = self.exam_type.id
-            request.session["questions_data"] = [
-                {
-                    "id": q.id,
-                    "text": q.question_text,
-                    "choices": q.options,  # ✅ store options here
-                    'points': q.points,
-                    'answers': q.answers,
-                    'explanation': q.explanation
-                }
-                for q in questions
-            ]
-            
-            request.session["start_time"] = time.time()
-            request.session["submitted_answers"] = {}
+        # ✅ Start an attempt ONCE per exam type; the session only keeps its id
+        attempt = self.get_current_attempt(request)
+        if attempt is None:
+            attempt = self.start_attempt(request)
             current_index = 0
             remaining_time = max_duration
         else:
-            # Load questions from session (no DB query)
-
             current_index = int(request.GET.get("q", 0))
-            start_time = request.session.get("start_time")
-            remaining_time = max_duration - int(time.time() - start_time)
-
-
-        questions_data = request.session["questions_data"]
-        questions = [
-                SimpleNamespace(
-                    id=q["id"],
-                    text=q["text"]+ f'\nSelect {len(q["answers"])} option(s).' if 'Select' not in q["text"] else q["text"] ,
-                    choices=q["choices"],
-                    points= q.get('points', 0),
-                    answers = q['answers'],
-                    explanation = q['explanation']
-                )
-                for q in questions_data
-            ]
+            remaining_time = max_duration - int(time.time() - attempt.started_at.timestamp())
+
+        # Only the current question is materialized while navigating
+        questions = AttemptQuestions(attempt.question_ids)
         total = len(questions)
+        if not total:
+            return self.render_results(request, [], attempt)
+        current_index = min(max(current_index, 0), total - 1)
         question = questions[current_index]
  
         
-        # Get previously selected labels for this question
+        # Answers in progress live in the session; the attempt gets them on
+        # submit
         answer_key = f"q_{question.id}"
-        submitted_answers = request.session.get("submitted_answers", {})
+        submitted_answers = request.session.get("exam_answers", {})
         selected_labels = submitted_answers.get(answer_key, [])
         
     
         # ✅ Timeout check
         if remaining_time <= 0:
-            return self.render_results(request, questions)
+            return self.render_results(request, questions.all(), attempt)
 
         # ✅ Handle POST
         if request.method == "POST":
-            submitted_answers = request.session.get("submitted_answers", {})
-
             for key, values in request.POST.lists():
                 if key.startswith("q_"):
                     submitted_answers[key] = values
-            request.session["submitted_answers"] = submitted_answers
-            request.session.modified = True
+            request.session["exam_answers"] = submitted_answers
 
             # Navigation
             if "next" in request.POST and current_index + 1 < total:
@@ -180,8 +176,11 @@ class MockExamPage(Page):
             elif "prev" in request.POST and current_index > 0:
                 current_index -= 1
             else:
-                return self.render_results(request, questions)
+                return self.render_results(request, questions.all(), attempt)
 
+            # Within the exam the session only needs to reach the cache
+            if hasattr(request.session, "defer_db_write"):
+                request.session.defer_db_write()
             return redirect(f"{request.path}?q={current_index}")
 
         
@@ -200,45 +199,36 @@ class MockExamPage(Page):
 
 
 
-    def render_results(self, request, questions):
-        submitted_answers = request.session.get("submitted_answers", {})
-        total_points = sum(getattr(q, "points", 0) for q in questions)
-        earned_points = 0
+    def render_results(self, request, questions, attempt):
+        submitted_answers = request.session.get("exam_answers", attempt.submitted_answers)
+        # Score every question in one vectorized pass
+        correct_flags, earned = score_attempt(questions, submitted_answers)
+        earned_points = as_points(earned.sum())
+        total_points = sum(q.points for q in questions)
         details = []
 
-        for q in questions:
-            qid = getattr(q, "id", None)
-            selected = submitted_answers.get(f"q_{qid}", [])
-
-            # Determine correct answers and check correctness
-           
-            correct_answers = getattr(q, "answers", [])  # maybe store in session if needed
-            is_correct = set(selected) == set(correct_answers)
-            options = getattr(q, "choices", {})
-            points = getattr(q, "points", 0)
-            explanation = getattr(q, "explanation", "")
-            question_text = getattr(q, "text", "")
-
-            if is_correct:
-                earned_points += points
-
+        for q, is_correct, points_earned in zip(questions, correct_flags, earned):
             details.append({
-                "question": question_text,
-                "options": options,
-                "selected": selected,
-                "correct_answers": correct_answers,
-                "is_correct": is_correct,
-                "points": points,
-                "explanation": explanation,
+                "question": q.text,
+                "options": q.choices,
+                "selected": submitted_answers.get(f"q_{q.id}", []),
+                "correct_answers": q.answers,
+                "is_correct": bool(is_correct),
+                "points": q.points,
+                "earned_points": as_points(points_earned),
+                "explanation": q.explanation,
             })
 
-        # Clear session after exam
-        print(request.session)
-        for key in ["submitted_answers", "questions_data", "exam_type_id", "start_time"]:
-            if key in request.session:
-                del request.session[key]
-
-        print(request.session)
+        # Close the attempt and clear the session after exam
+        attempt.submitted_answers = submitted_answers
+        attempt.finished_at = timezone.now()
+        attempt.earned_points = float(earned_points)
+        attempt.total_points = total_points
+        attempt.save(update_fields=[
+            "submitted_answers", "finished_at", "earned_points", "total_points"
+        ])
+        request.session.pop("exam_attempt_id", None)
+        request.session.pop("exam_answers", None)
 
         return render(request, self.template, {
             "page": self,
@@ -249,4 +239,27 @@ class MockExamPage(Page):
                 "total_points": total_points,
                 "percentage": round(earned_points / total_points * 100, 1) if total_points else 0,
             },
-        })
\ No newline at end of file
+        })
+
+
+class ExamAttempt(models.Model):
+    """One run through a mock exam: the drawn question ids and the answers."""
+    page = models.ForeignKey(
+        MockExamPage, on_delete=models.CASCADE, related_name="attempts"
+    )
+    exam_type = models.ForeignKey(
+        ExamType, on_delete=models.CASCADE, related_name="attempts"
+    )
+    # Ordered question ids; bodies are resolved from the question bank cache
+    question_ids = models.JSONField(default=list)
+    # {"q_<question id>": [selected labels]}, kept in the session until the
+    # attempt is submitted
+    submitted_answers = models.JSONField(default=dict)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    # Filled in when the attempt is submitted, updated by regrade_attempts
+    earned_points = models.FloatField(blank=True, null=True)
+    total_points = models.PositiveIntegerField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.exam_type} attempt started {self.started_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,172 @@
+import random
+import threading
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from base.cache import bump_version, get_version
+
+# Id lists are invalidated on save, delete and import; the timeout is only a
+# safety net for changes made behind the ORM's back.
+QUESTION_IDS_CACHE_TIMEOUT = 60 * 60
+QUESTION_IDS_CACHE_KEY = "quiz:question_ids:{exam_type_id}"
+
+
+def _question_ids_key(exam_type_id):
+    return QUESTION_IDS_CACHE_KEY.format(exam_type_id=exam_type_id)
+
+
+def get_question_ids(exam_type_id):
+    """Return the list of question ids for an exam type, cached."""
+    key = _question_ids_key(exam_type_id)
+    ids = cache.get(key)
+    if ids is None:
+        from quiz.models import ExamQuestion
+
+        ids = list(
+            ExamQuestion.objects.filter(exam_type_id=exam_type_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        cache.set(key, ids, QUESTION_IDS_CACHE_TIMEOUT)
+    return ids
+
+
+def invalidate_question_ids(exam_type_id):
+    cache.delete(_question_ids_key(exam_type_id))
+
+
+def sample_question_ids(exam_type_id, count):
+    """Pick up to ``count`` random question ids without loading the bank."""
+    ids = get_question_ids(exam_type_id)
+    return random.sample(ids, min(count, len(ids)))
+
+
+def sample_questions(exam_type_id, count):
+    """Return up to ``count`` random questions, in sampled order.
+
+    Only the chosen rows are fetched, with a single ``in_bulk`` query. Ids
+    that disappeared since the id list was cached are skipped.
+    """
+    from quiz.models import ExamQuestion
+
+    ids = sample_question_ids(exam_type_id, count)
+    if not ids:
+        return []
+    by_id = ExamQuestion.objects.filter(exam_type_id=exam_type_id).in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+# In-process cache of question bodies, shared by every exam attempt served by
+# this worker. Saving or deleting a question bumps a version in the shared
+# cache, and each worker drops its entries when it sees a new version.
+QUESTION_DATA_CACHE_SIZE = 5000
+QUESTION_DATA_VERSION_KEY = "quiz:question_data_version"
+_question_data = OrderedDict()
+_question_data_version = None
+_question_data_lock = threading.Lock()
+
+
+class QuestionRecord:
+    """Read-only view of a question, as shown while taking an exam."""
+
+    __slots__ = ("id", "text", "choices", "points", "answers", "explanation")
+
+    def __init__(self, question):
+        self.id = question.pk
+        text = question.question_text
+        if "Select" not in text:
+            text += f"\nSelect {len(question.answers)} option(s)."
+        self.text = text
+        self.choices = question.options
+        self.points = question.points
+        self.answers = question.answers
+        self.explanation = question.explanation
+
+
+def get_question_data(question_ids):
+    """Return ``QuestionRecord``s for ``question_ids``, in the given order.
+
+    Questions missing from the in-process cache are fetched with a single
+    ``in_bulk`` query; deleted questions are skipped.
+    """
+    global _question_data_version
+
+    version = get_version(QUESTION_DATA_VERSION_KEY)
+    found = {}
+    with _question_data_lock:
+        if version != _question_data_version:
+            _question_data.clear()
+            _question_data_version = version
+        for pk in question_ids:
+            record = _question_data.get(pk)
+            if record is not None:
+                _question_data.move_to_end(pk)
+                found[pk] = record
+
+    missing = [pk for pk in question_ids if pk not in found]
+    if missing:
+        from quiz.models import ExamQuestion
+
+        fetched = ExamQuestion.objects.only(
+            "question_text", "options", "answers", "points", "explanation"
+        ).in_bulk(missing)
+        with _question_data_lock:
+            for pk, question in fetched.items():
+                found[pk] = _question_data[pk] = QuestionRecord(question)
+            while len(_question_data) > QUESTION_DATA_CACHE_SIZE:
+                _question_data.popitem(last=False)
+
+    return [found[pk] for pk in question_ids if pk in found]
+
+
+def forget_question_data(question_id):
+    with _question_data_lock:
+        _question_data.pop(question_id, None)
+    # Other workers can't drop a single entry: they start over
+    bump_version(QUESTION_DATA_VERSION_KEY)
+
+
+def clear_question_data():
+    with _question_data_lock:
+        _question_data.clear()
+    bump_version(QUESTION_DATA_VERSION_KEY)
+
+
+class RemovedQuestion:
+    """Stands in for a question deleted after it was drawn for an attempt:
+    it has no choices and scores nothing."""
+
+    __slots__ = QuestionRecord.__slots__
+
+    def __init__(self, question_id):
+        self.id = question_id
+        self.text = "This question has been removed from the exam."
+        self.choices = {}
+        self.points = 0
+        self.answers = []
+        self.explanation = ""
+
+
+class AttemptQuestions:
+    """Lazy, indexable sequence of the questions drawn for an attempt.
+
+    Indexing materializes a single record, so navigating an exam costs the
+    same whatever its length; ``all()`` resolves every question at once.
+    Questions deleted since the attempt was drawn keep their position as a
+    ``RemovedQuestion`` and are left out of ``all()``.
+    """
+
+    def __init__(self, question_ids):
+        self.question_ids = question_ids
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def __getitem__(self, index):
+        question_id = self.question_ids[index]
+        records = get_question_data([question_id])
+        return records[0] if records else RemovedQuestion(question_id)
+
+    def all(self):
+        return get_question_data(self.question_ids)
@@ -0,0 +1,117 @@
+"""Vectorized exam scoring.
+
+Option labels are encoded as bitmasks (``A`` -> bit 0, ``B`` -> bit 1, ...),
+so the correct answers and the selections of any number of questions become
+two integer arrays that are scored in a single NumPy pass.
+"""
+import numpy as np
+from django.conf import settings
+
+ALL_OR_NOTHING = "all_or_nothing"
+# Credit for every correct label picked, minus every wrong one, never below 0
+PARTIAL = "partial"
+POLICIES = (ALL_OR_NOTHING, PARTIAL)
+
+MASK_DTYPE = np.uint32
+
+
+def get_default_policy():
+    return getattr(settings, "QUIZ_SCORING_POLICY", ALL_OR_NOTHING)
+
+
+def label_mask(labels):
+    """Encode a list of option labels such as ``["A", "C"]`` as an int."""
+    mask = 0
+    for label in labels:
+        offset = ord(label.strip().upper()[:1] or "?") - ord("A")
+        if 0 <= offset < 26:
+            mask |= 1 << offset
+    return mask
+
+
+def encode_labels(label_lists):
+    return np.fromiter(
+        (label_mask(labels) for labels in label_lists), dtype=MASK_DTYPE
+    )
+
+
+def _popcount(masks):
+    as_bytes = masks.astype(MASK_DTYPE).view(np.uint8).reshape(-1, 4)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1, dtype=np.int64)
+
+
+def score_masks(keys, selections, points, policy=None):
+    """Return ``(is_correct, earned)`` arrays for aligned answer keys,
+    selections and point values."""
+    policy = policy or get_default_policy()
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown scoring policy: {policy!r}")
+    keys = np.asarray(keys, dtype=MASK_DTYPE)
+    selections = np.asarray(selections, dtype=MASK_DTYPE)
+    points = np.asarray(points, dtype=np.float64)
+
+    is_correct = keys == selections
+    if policy == ALL_OR_NOTHING:
+        return is_correct, np.where(is_correct, points, 0.0)
+
+    hits = _popcount(keys & selections)
+    wrong = _popcount(selections & ~keys)
+    expected = np.maximum(_popcount(keys), 1)
+    credit = np.clip((hits - wrong) / expected, 0.0, 1.0)
+    return is_correct, credit * points
+
+
+def score_attempt(questions, submitted_answers, policy=None):
+    """Score one attempt.
+
+    ``questions`` are records with ``id``, ``answers`` and ``points``;
+    ``submitted_answers`` maps ``"q_<id>"`` to the selected labels.
+    """
+    keys = encode_labels(q.answers for q in questions)
+    selections = encode_labels(
+        submitted_answers.get(f"q_{q.id}", []) for q in questions
+    )
+    points = np.fromiter((q.points for q in questions), dtype=np.float64)
+    return score_masks(keys, selections, points, policy)
+
+
+def score_attempts(attempts, answer_keys, policy=None):
+    """Score many attempts in one pass.
+
+    ``attempts`` is a sequence of ``(question_ids, submitted_answers)`` and
+    ``answer_keys`` maps question id to ``(answers, points)``. Questions that
+    no longer exist are ignored. Returns ``(earned, total)`` arrays with one
+    entry per attempt.
+    """
+    attempt_index, question_ids, selected = [], [], []
+    for index, (ids, answers) in enumerate(attempts):
+        for qid in ids:
+            if qid in answer_keys:
+                attempt_index.append(index)
+                question_ids.append(qid)
+                selected.append(answers.get(f"q_{qid}", []))
+
+    known_ids = np.fromiter(answer_keys, dtype=np.int64, count=len(answer_keys))
+    order = np.argsort(known_ids)
+    known_ids = known_ids[order]
+    key_masks = encode_labels(a for a, _ in answer_keys.values())[order]
+    key_points = np.fromiter(
+        (p for _, p in answer_keys.values()), dtype=np.float64, count=len(answer_keys)
+    )[order]
+
+    rows = np.searchsorted(known_ids, np.asarray(question_ids, dtype=np.int64))
+    _, earned = score_masks(
+        key_masks[rows], encode_labels(selected), key_points[rows], policy
+    )
+    attempt_index = np.asarray(attempt_index, dtype=np.int64)
+    count = len(attempts)
+    return (
+        np.bincount(attempt_index, weights=earned, minlength=count),
+        np.bincount(attempt_index, weights=key_points[rows], minlength=count),
+    )
+
+
+def as_points(value):
+    """Show whole points as ints and partial credit with two decimals."""
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from quiz.models import ExamQuestion
+from quiz.question_bank import forget_question_data, invalidate_question_ids
+
+
+@receiver(pre_save, sender=ExamQuestion)
+def remember_previous_exam_type(sender, instance, **kwargs):
+    # A question moved to another exam type must leave the old id list too.
+    instance._previous_exam_type_id = None
+    if instance.pk:
+        instance._previous_exam_type_id = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("exam_type_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=ExamQuestion)
+def question_saved(sender, instance, created, **kwargs):
+    invalidate_question_ids(instance.exam_type_id)
+    forget_question_data(instance.pk)
+    previous = getattr(instance, "_previous_exam_type_id", None)
+    if previous and previous != instance.exam_type_id:
+        invalidate_question_ids(previous)
+
+
+@receiver(post_delete, sender=ExamQuestion)
+def question_deleted(sender, instance, **kwargs):
+    invalidate_question_ids(instance.exam_type_id)
+    forget_question_data(instance.pk)
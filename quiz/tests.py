@@ -1,3 +1,475 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from wagtail.models import Site
+
+from base.cache import bump_version
+from quiz.models import ExamAttempt, ExamQuestion, ExamType, MockExamPage
+from quiz.question_bank import (
+    QUESTION_DATA_VERSION_KEY,
+    RemovedQuestion,
+    get_question_data,
+    get_question_ids,
+    sample_questions,
+)
+from quiz.scoring import ALL_OR_NOTHING, PARTIAL, label_mask, score_attempts, score_masks
+from quiz.tools import exam_pdf
+
+
+def make_question(exam_type, text="Question", answers=("A",), **kwargs):
+    return ExamQuestion.objects.create(
+        exam_type=exam_type,
+        question_text=text,
+        options={"A": "Option A", "B": "Option B", "C": "Option C"},
+        answers=list(answers),
+        **kwargs,
+    )
+
+
+class QuestionSamplingTests(TestCase):
+    """
+    Tests for id-list based question sampling.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.exam_type = ExamType.objects.create(code="tta", name="TTA")
+        self.questions = [
+            make_question(self.exam_type, text=f"Question {i}") for i in range(10)
+        ]
+
+    def test_sample_returns_distinct_questions(self):
+        sampled = sample_questions(self.exam_type.id, 4)
+        self.assertEqual(len(sampled), 4)
+        self.assertEqual(len({q.pk for q in sampled}), 4)
+
+    def test_sample_is_capped_by_bank_size(self):
+        self.assertEqual(len(sample_questions(self.exam_type.id, 50)), 10)
+
+    def test_warm_sample_only_fetches_chosen_rows(self):
+        get_question_ids(self.exam_type.id)
+        with self.assertNumQueries(1):
+            sample_questions(self.exam_type.id, 4)
+
+    def test_id_list_invalidated_on_save_and_delete(self):
+        get_question_ids(self.exam_type.id)
+        new_question = make_question(self.exam_type)
+        self.assertIn(new_question.pk, get_question_ids(self.exam_type.id))
+
+        new_question.delete()
+        self.assertNotIn(new_question.pk, get_question_ids(self.exam_type.id))
+
+    def test_moving_question_invalidates_previous_exam_type(self):
+        other = ExamType.objects.create(code="ta", name="TA")
+        get_question_ids(self.exam_type.id)
+        question = self.questions[0]
+        question.exam_type = other
+        question.save()
+        self.assertNotIn(question.pk, get_question_ids(self.exam_type.id))
+        self.assertIn(question.pk, get_question_ids(other.id))
+
+
+class MockExamPageTests(TestCase):
+    """
+    Tests for taking an exam through MockExamPage.serve.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.exam_type = ExamType.objects.create(
+            code="tta", name="TTA", default_question_count=3
+        )
+        for i in range(5):
+            make_question(self.exam_type, text=f"Question {i}")
+        root = Site.objects.get(is_default_site=True).root_page
+        self.page = MockExamPage(title="Exam", slug="exam", exam_type=self.exam_type)
+        root.add_child(instance=self.page)
+
+    def test_session_only_stores_attempt_id(self):
+        response = self.client.get(self.page.url)
+        self.assertEqual(response.status_code, 200)
+        attempt = ExamAttempt.objects.get()
+        self.assertEqual(len(attempt.question_ids), 3)
+        self.assertEqual(self.client.session["exam_attempt_id"], attempt.id)
+        self.assertNotIn("questions_data", self.client.session)
+
+    def test_answers_are_stored_on_attempt_and_scored(self):
+        self.client.get(self.page.url)
+        attempt = ExamAttempt.objects.get()
+        first, second, third = attempt.question_ids
+
+        response = self.client.post(self.page.url, {f"q_{first}": ["A"], "next": ""})
+        self.assertRedirects(response, f"{self.page.url}?q=1", fetch_redirect_response=False)
+        self.assertEqual(self.client.session["exam_answers"], {f"q_{first}": ["A"]})
+        # Only the cached session was written, not the attempt or the session row
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.submitted_answers, {})
+        stored = Session.objects.get(session_key=self.client.session.session_key)
+        self.assertEqual(stored.get_decoded()["exam_answers"], {})
+
+        response = self.client.post(f"{self.page.url}?q=1", {f"q_{second}": ["B"]})
+        self.assertTrue(response.context["submitted"])
+        self.assertEqual(response.context["score"]["earned_points"], 1)
+        self.assertEqual(response.context["score"]["total_points"], 3)
+        attempt.refresh_from_db()
+        self.assertIsNotNone(attempt.finished_at)
+        self.assertEqual(
+            attempt.submitted_answers, {f"q_{first}": ["A"], f"q_{second}": ["B"]}
+        )
+        self.assertNotIn("exam_attempt_id", self.client.session)
+        stored = Session.objects.get(session_key=self.client.session.session_key)
+        self.assertNotIn("exam_answers", stored.get_decoded())
+
+    def test_question_data_is_refreshed_after_edit(self):
+        question = ExamQuestion.objects.first()
+        record = get_question_data([question.pk])[0]
+        self.assertEqual(record.text, f"{question.question_text}\nSelect 1 option(s).")
+        question.question_text = "Edited. Select 1 option."
+        question.save()
+        self.assertEqual(get_question_data([question.pk])[0].text, "Edited. Select 1 option.")
+
+    def test_question_data_is_refreshed_after_edit_by_another_worker(self):
+        question = ExamQuestion.objects.first()
+        get_question_data([question.pk])
+        # The other worker's signal handler only bumps the shared version here
+        ExamQuestion.objects.filter(pk=question.pk).update(
+            question_text="Edited. Select 1 option."
+        )
+        bump_version(QUESTION_DATA_VERSION_KEY)
+        self.assertEqual(get_question_data([question.pk])[0].text, "Edited. Select 1 option.")
+
+    def test_questions_deleted_during_attempt_keep_their_place(self):
+        self.client.get(self.page.url)
+        attempt = ExamAttempt.objects.get()
+        first, second, third = attempt.question_ids
+        ExamQuestion.objects.filter(pk=second).delete()
+
+        response = self.client.get(f"{self.page.url}?q=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context["question"], RemovedQuestion)
+        self.assertEqual(response.context["total"], 3)
+        response = self.client.get(f"{self.page.url}?q=2")
+        self.assertEqual(response.context["question"].id, third)
+
+        response = self.client.post(f"{self.page.url}?q=2", {f"q_{third}": ["A"]})
+        self.assertEqual(response.context["score"]["total_points"], 2)
+
+    def test_out_of_range_question_index_is_clamped(self):
+        self.client.get(self.page.url)
+        attempt = ExamAttempt.objects.get()
+        response = self.client.get(f"{self.page.url}?q=9")
+        self.assertEqual(response.context["current_index"], 2)
+        self.assertEqual(response.context["question"].id, attempt.question_ids[2])
+
+    def test_navigation_only_resolves_current_question(self):
+        self.client.get(self.page.url)
+        attempt = ExamAttempt.objects.get()
+        response = self.client.get(f"{self.page.url}?q=2")
+        self.assertEqual(response.context["question"].id, attempt.question_ids[2])
+        self.assertEqual(response.context["total"], 3)
+
+
+class ScoringTests(SimpleTestCase):
+    """
+    Tests for bitmask based scoring.
+    """
+
+    def test_label_mask(self):
+        self.assertEqual(label_mask(["A", "c"]), 0b101)
+        self.assertEqual(label_mask([]), 0)
+
+    def test_all_or_nothing(self):
+        keys = [label_mask(["A"]), label_mask(["A", "B"]), label_mask(["C"])]
+        selected = [label_mask(["A"]), label_mask(["A"]), label_mask(["D"])]
+        is_correct, earned = score_masks(keys, selected, [1, 2, 1], ALL_OR_NOTHING)
+        self.assertEqual(is_correct.tolist(), [True, False, False])
+        self.assertEqual(earned.tolist(), [1.0, 0.0, 0.0])
+
+    def test_partial_credit(self):
+        keys = [label_mask(["A", "B"])] * 3
+        selected = [label_mask(["A"]), label_mask(["A", "C"]), label_mask(["C", "D"])]
+        _, earned = score_masks(keys, selected, [2, 2, 2], PARTIAL)
+        self.assertEqual(earned.tolist(), [1.0, 0.0, 0.0])
+
+    def test_score_many_attempts(self):
+        answer_keys = {1: (["A"], 1), 2: (["B", "C"], 2), 3: (["D"], 1)}
+        attempts = [
+            ([1, 2], {"q_1": ["A"], "q_2": ["C", "B"]}),
+            ([2, 3, 99], {"q_3": ["A"]}),
+        ]
+        earned, total = score_attempts(attempts, answer_keys, ALL_OR_NOTHING)
+        self.assertEqual(earned.tolist(), [3.0, 0.0])
+        self.assertEqual(total.tolist(), [3.0, 3.0])
+
+
+class RegradeAttemptsTests(TestCase):
+    def test_regrade_after_answer_key_correction(self):
+        exam_type = ExamType.objects.create(code="tta", name="TTA")
+        question = make_question(exam_type, answers=["A"])
+        root = Site.objects.get(is_default_site=True).root_page
+        page = root.add_child(instance=MockExamPage(title="Exam", exam_type=exam_type))
+        attempt = ExamAttempt.objects.create(
+            page=page,
+            exam_type=exam_type,
+            question_ids=[question.pk],
+            submitted_answers={f"q_{question.pk}": ["B"]},
+            finished_at=timezone.now(),
+            earned_points=0,
+            total_points=1,
+        )
+        question.answers = ["B"]
+        question.save()
+
+        call_command("regrade_attempts", stdout=StringIO())
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.earned_points, 1)
+
+
+class ImportQuestionsTests(TestCase):
+    def import_file(self, path, **kwargs):
+        call_command("import_questions", path, exam_type="tta", stdout=StringIO(), **kwargs)
+
+    def test_import_is_idempotent(self):
+        path = os.path.join(os.path.dirname(__file__), "tools", "tta_questions_1.json")
+        with open(path) as f:
+            expected = len({q["question_id"] for q in json.load(f)})
+
+        self.import_file(path, batch_size=7)
+        self.import_file(path, batch_size=7)
+        self.assertEqual(ExamQuestion.objects.filter(exam_type__code="tta").count(), expected)
+
+    def test_jsonl_import_updates_existing_questions(self):
+        record = {
+            "question_id": "X1",
+            "question_text": "Original",
+            "options": {"A": "a", "B": "b"},
+            "answers": ["A"],
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write(json.dumps(record) + "\n")
+            f.write(json.dumps({**record, "question_id": "X2"}) + "\n")
+        self.addCleanup(os.remove, f.name)
+        self.import_file(f.name)
+
+        with open(f.name, "w") as out:
+            out.write(json.dumps({**record, "answers": ["B"]}) + "\n")
+        self.import_file(f.name)
+
+        self.assertEqual(ExamQuestion.objects.count(), 2)
+        self.assertEqual(ExamQuestion.objects.get(external_id="X1").answers, ["B"])
+
+    def test_import_adopts_questions_without_external_id(self):
+        exam_type = ExamType.objects.create(code="tta", name="TTA")
+        existing = make_question(exam_type, text="Original")
+        record = {
+            "question_id": "X1",
+            "question_text": "Original",
+            "options": {"A": "a", "B": "b"},
+            "answers": ["B"],
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write(json.dumps(record) + "\n")
+        self.addCleanup(os.remove, f.name)
+        self.import_file(f.name)
+
+        existing.refresh_from_db()
+        self.assertEqual(ExamQuestion.objects.count(), 1)
+        self.assertEqual(existing.external_id, "X1")
+        self.assertEqual(existing.answers, ["B"])
+
+
+# Page texts as laid out by pdfplumber; a question and an answer row run
+# over a page break.
+QUESTION_PAGES = [
+    """Question #1 (1 Point)
+Which technique suits input ranges best?
+a) Boundary value
+analysis
+b) Decision table testing
+c) State""",
+    """transition testing
+d) Pairwise testing
+Select ONE option.
+Question #X2 (2 Points)
+Which are static analysis tools?
+a) Linters
+b) Debuggers
+c) Data flow analysers
+Select TWO options.""",
+]
+ANSWER_PAGES = [
+    """Question Correct Answer Explanation / Rationale Learning Objective K-Level Points
+1 a a) Is correct. Boundary values sit at
+the edges of the input ranges.""",
+    """b) Is not correct. TTA-1.2.3 K2 1
+X2 a, c a) Is correct.
+c) Is correct. TTA-3.1.1 K3 2""",
+]
+
+
+class ExamPdfParserTests(SimpleTestCase):
+    """
+    Tests for the streaming question and answer parsers of exam_pdf.
+    """
+
+    def parse_questions(self, pages):
+        parser = exam_pdf.QuestionParser()
+        return [question for text in pages for question in parser.feed(text)]
+
+    def parse_answers(self, pages):
+        parser = exam_pdf.AnswerParser()
+        answers = [answer for text in pages for answer in parser.feed(text)]
+        return answers + list(parser.close())
+
+    def test_questions_split_across_pages(self):
+        first, second = self.parse_questions(QUESTION_PAGES)
+        self.assertEqual(first, {
+            "question_id": "1",
+            "points": 1,
+            "question_text": "Which technique suits input ranges best?",
+            "options": {
+                "A": "Boundary value analysis",
+                "B": "Decision table testing",
+                "C": "State transition testing",
+                "D": "Pairwise testing",
+            },
+            "select_count": 1,
+        })
+        self.assertEqual(second["question_id"], "X2")
+        self.assertEqual(second["points"], 2)
+        self.assertEqual(second["select_count"], 2)
+        self.assertEqual(list(second["options"]), ["A", "B", "C"])
+
+    def test_unterminated_question_is_held_back(self):
+        parser = exam_pdf.QuestionParser()
+        self.assertEqual(list(parser.feed("Question #3 (1 Point)\nNo options follow")), [])
+        self.assertIn("Question #3", parser.buffer)
+        # Completed by the next page
+        (question,) = parser.feed("a) Yes\nb) No\nSelect ONE option.")
+        self.assertEqual(question["options"], {"A": "Yes", "B": "No"})
+
+    def test_question_without_options(self):
+        pages = ["Question #4 (1 Point)\nJust text\nSelect ONE option."]
+        (question,) = self.parse_questions(pages)
+        self.assertEqual(question["question_text"], "Just text")
+        self.assertEqual(question["options"], {})
+
+    def test_answer_blocks_split_across_pages(self):
+        first, second = self.parse_answers(ANSWER_PAGES)
+        self.assertEqual(first["question_id"], "1")
+        self.assertEqual(first["answers"], ["A"])
+        self.assertEqual(first["explanation"], (
+            "a) Is correct. Boundary values sit at\nthe edges of the input ranges.\n"
+            "b) Is not correct. TTA-1.2.3 K2 1"
+        ))
+        self.assertEqual(
+            (first["learning_objective"], first["klevel"], first["points"]),
+            ("TTA-1.2.3", "K2", 1),
+        )
+        self.assertEqual(second["question_id"], "X2")
+        self.assertEqual(second["answers"], ["A", "C"])
+        self.assertEqual(second["points"], 2)
+
+    def test_malformed_answer_blocks(self):
+        # Lines before the first answer row are dropped; a row without an
+        # option after its labels has no answers and the default points
+        (answer,) = self.parse_answers(["Stray text\n5 b see the syllabus"])
+        self.assertEqual(answer["question_id"], "5")
+        self.assertEqual(answer["answers"], [])
+        self.assertIsNone(answer["learning_objective"])
+        self.assertEqual(answer["points"], 1)
+
+    def test_extract_exam_joins_questions_and_answers(self):
+        # Answer 99 has no question and is left out
+        pages = {"questions.pdf": QUESTION_PAGES, "answers.pdf": ANSWER_PAGES + ["99 a a) Orphan"]}
+
+        def iter_page_texts(executor, path, *args, **kwargs):
+            return pages[path]
+
+        with mock.patch.object(exam_pdf, "ProcessPoolExecutor"), mock.patch.object(
+            exam_pdf, "iter_page_texts", side_effect=iter_page_texts
+        ):
+            records = exam_pdf.extract_exam("questions.pdf", "answers.pdf")
+        self.assertEqual([record["question_id"] for record in records], ["1", "X2"])
+        self.assertEqual(
+            records[1]["question_text"], "Which are static analysis tools?\n Select 2 option(s)."
+        )
+        self.assertEqual(records[1]["answers"], ["A", "C"])
+
+
+class SynchronousExecutor:
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+class PageTextCacheTests(SimpleTestCase):
+    """
+    Tests for the on-disk cache of extracted PDF page texts.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.cache = exam_pdf.PageTextCache(os.path.join(self.temp_dir, "cache"))
+
+    def write_pdf(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_key_follows_content_and_options(self):
+        pdf = self.write_pdf("exam.pdf", b"%PDF one")
+        options = dict(exam_pdf.EXTRACT_OPTIONS)
+        path = self.cache.path_for(pdf, options)
+        copy = self.write_pdf("copy.pdf", b"%PDF one")
+        other = self.write_pdf("other.pdf", b"%PDF two")
+        self.assertEqual(self.cache.path_for(copy, options), path)
+        self.assertNotEqual(self.cache.path_for(other, options), path)
+        self.assertNotEqual(self.cache.path_for(pdf, {**options, "x_tolerance": 2}), path)
+        self.assertNotEqual(self.cache.path_for(pdf, {**options, "layout": False}), path)
+
+    def test_save_and_load_round_trip(self):
+        path = self.cache.path_for(self.write_pdf("exam.pdf", b"%PDF"), {})
+        self.assertEqual(self.cache.load(path), {})
+        pages = {0: "Question #1 (1 Point)", 3: "Ünïcode – text"}
+        self.cache.save(path, pages)
+        self.assertEqual(self.cache.load(path), pages)
+
+    def read_pages(self, pdf, first_page=0):
+        with mock.patch.object(exam_pdf.pdfplumber, "open") as open_pdf:
+            open_pdf.return_value.__enter__.return_value.pages = [None] * 5
+            texts = exam_pdf.iter_page_texts(
+                SynchronousExecutor(), pdf, first_page, chunk_size=2, cache=self.cache
+            )
+            return list(texts)
+
+    def test_cached_pages_are_not_extracted_again(self):
+        pdf = self.write_pdf("exam.pdf", b"%PDF")
+        with mock.patch.object(
+            exam_pdf, "_extract_pages",
+            side_effect=lambda path, numbers, options: [f"page {n}" for n in numbers],
+        ) as extract:
+            self.assertEqual(self.read_pages(pdf, first_page=2), ["page 2", "page 3", "page 4"])
+            self.assertEqual(extract.call_count, 2)
+
+            self.assertEqual(self.read_pages(pdf, first_page=2), ["page 2", "page 3", "page 4"])
+            self.assertEqual(extract.call_count, 2)
+
+            # Only the pages missing from the cache are submitted
+            self.assertEqual(self.read_pages(pdf)[:2], ["page 0", "page 1"])
+            self.assertEqual(extract.call_count, 3)
+            extract.assert_called_with(pdf, [0, 1], exam_pdf.EXTRACT_OPTIONS)
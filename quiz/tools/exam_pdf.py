@@ -0,0 +1,310 @@
+"""Extract an ISTQB sample exam (questions PDF + answers PDF) to JSONL.
+
+Pages are laid out by pdfplumber in a process pool and streamed, in page
+order, into incremental parsers; questions and answers are joined by
+question id and written one JSON object per line, ready for
+``manage.py import_questions``.
+
+Layout analysis is by far the slowest step, so page texts are cached on disk
+keyed by the PDF's content hash and the extraction options; iterating on
+the parsing rules re-uses them and never re-runs pdfplumber.
+
+    python exam_pdf.py ISTQB_CTAL-TTA_Sample-Exam-Questions_v4.2.pdf \\
+        ISTQB_CTAL-TTA_Sample-Exam-Answers_v4.2.pdf -o tta_questions.jsonl
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+EXTRACT_OPTIONS = {"x_tolerance": 1, "y_tolerance": 1, "layout": True}
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "drimvision", "pdf_text"
+)
+
+# --- Questions ---
+# A block starts with "Question #<id> (<points> Points)" and ends with
+# "Select ONE option." or "Select TWO options."
+QUESTION_BLOCK = re.compile(
+    r'(Question #[X]?\d+ \(\d+ Point[s]?\).*?Select (?:ONE|TWO) option[s]??\.)',
+    re.DOTALL,
+)
+QUESTION_NUMBER = re.compile(r'Question #([X]?\d+)')
+QUESTION_POINTS = re.compile(r'\((\d+) Point[s]?\)')
+SELECT_COUNT = re.compile(r'Select (\w+) option[s]?')
+QUESTION_CORE = re.compile(
+    r'(Question #[X]?\d+ \(\d+ Point[s]?\)(.*?)Select (?:ONE|TWO) option[s]??\.)',
+    re.DOTALL,
+)
+FIRST_OPTION = re.compile(r'(?=\n?[a]\))')
+OPTION = re.compile(
+    r'(?:^|\s)([a-zA-Z])\)\s*([^a-zA-Z]*?)(?=(?:\s[a-zA-Z]\))|\Z)',
+    re.DOTALL,
+)
+OPTION_SPLIT = re.compile(r'([a-zA-Z]\))')
+WHITESPACE = re.compile(r'\s+')
+
+# --- Answers ---
+# Header/footer junk repeated on every answers page
+ANSWER_PAGE_JUNK = [
+    re.compile(r'Technical Test Analyst, Advanced Level.*?(?=\n)'),
+    re.compile(r'Sample Exam.*?(?=\n)'),
+    re.compile(r'^\s*–+\s*$', re.MULTILINE),
+    re.compile(r'©.*?Page \d+.*?\n'),
+    re.compile(r'^\s*$', re.MULTILINE),
+    re.compile(r'^\s*Answers\s*$', re.MULTILINE),
+    re.compile(r'Version 4.2\s+Page.*?Board', re.DOTALL),
+    re.compile(r'Question\s+Correct.*?Points', re.DOTALL),
+]
+# "1 a,b ..." or "X1 d ..." starts the answer row of a question
+ANSWER_ROW = re.compile(r'^\s*(X?\d+)\s+[a-eA-E, ]+\s+')
+ANSWER_ID = re.compile(r'^\s*(X?\d+)')
+ANSWER_LABELS = re.compile(r'^\s*X?\d+\s+([a-eA-E, ]+)\s+[aA]\)')
+LABEL_SEPARATOR = re.compile(r'[, ]+')
+LEARNING_OBJECTIVE = re.compile(r'(TTA-\d+\.\d+\.\d+)\s+(K\d)\s+(\d+)')
+
+
+def _extract_pages(pdf_path, page_numbers, options):
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[n].extract_text(**options) or "" for n in page_numbers]
+
+
+class PageTextCache:
+    """Extracted page texts, one gzipped JSON file per PDF and option set.
+
+    Files are named after the SHA-256 of the PDF bytes and of the extraction
+    options (plus the pdfplumber version), so a changed PDF or a different
+    ``x_tolerance`` / ``y_tolerance`` / ``layout`` never hits stale text.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path_for(self, pdf_path, options):
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        params = json.dumps(
+            {"options": options, "pdfplumber": pdfplumber.__version__}, sort_keys=True
+        )
+        params_digest = hashlib.sha256(params.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}-{params_digest}.json.gz")
+
+    def load(self, path):
+        """Return ``{page number: text}``, empty if nothing is cached."""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return {int(n): text for n, text in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, path, pages):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({str(n): text for n, text in pages.items()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def iter_page_texts(executor, pdf_path, first_page=0, chunk_size=4, options=None, cache=None):
+    """Submit the layout analysis of every page from ``first_page`` on to
+    ``executor`` and yield the page texts in order as they become ready.
+
+    Pages found in ``cache`` are not submitted at all; newly extracted pages
+    are added to it once the last page has been yielded.
+    """
+    options = {**EXTRACT_OPTIONS, **(options or {})}
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+
+    cache_path = cache.path_for(pdf_path, options) if cache else None
+    cached = cache.load(cache_path) if cache else {}
+    missing = [n for n in range(first_page, page_count) if n not in cached]
+    chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    futures = [
+        (chunk, executor.submit(_extract_pages, pdf_path, chunk, options))
+        for chunk in chunks
+    ]
+    submitted = {n: entry for entry in futures for n in entry[0]}
+
+    def results():
+        for n in range(first_page, page_count):
+            if n not in cached:
+                chunk, future = submitted[n]
+                cached.update(zip(chunk, future.result()))
+            yield cached[n]
+        if cache and missing:
+            cache.save(cache_path, cached)
+
+    return results()
+
+
+class QuestionParser:
+    """Incrementally cut question blocks out of streamed page text."""
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, text):
+        self.buffer += text + "\n"
+        end = 0
+        for match in QUESTION_BLOCK.finditer(self.buffer):
+            end = match.end()
+            yield self.parse_block(match.group(1))
+        self.buffer = self.buffer[end:]
+
+    @staticmethod
+    def parse_block(block):
+        num_match = QUESTION_NUMBER.search(block)
+        pts_match = QUESTION_POINTS.search(block)
+        sel_match = SELECT_COUNT.search(block)
+        core_match = QUESTION_CORE.search(block)
+        core = core_match.group(2).strip() if core_match else "Unknown question"
+
+        parts = FIRST_OPTION.split(core.strip(), maxsplit=1)
+        if len(parts) == 2:
+            question_text, options_text = parts[0].strip(), parts[1]
+        else:
+            question_text, options_text = core.strip(), ""
+
+        options = {}
+        for m in OPTION.finditer(options_text):
+            text_opt = WHITESPACE.sub(" ", m.group(2).strip())
+            if text_opt:
+                options[m.group(1).upper()] = text_opt
+
+        # Fallback: if only one key detected, retry more generously
+        if len(options) <= 1:
+            parts = OPTION_SPLIT.split(options_text)
+            options = {
+                parts[i][0].upper(): WHITESPACE.sub(" ", (parts[i + 1] if i + 1 < len(parts) else "").strip())
+                for i in range(1, len(parts), 2)
+            }
+
+        return {
+            "question_id": num_match.group(1) if num_match else None,
+            "points": int(pts_match.group(1)) if pts_match else 1,
+            "question_text": question_text.strip(),
+            "options": options,
+            "select_count": 1 if sel_match and sel_match.group(1).upper() == "ONE" else 2,
+        }
+
+
+class AnswerParser:
+    """Incrementally group answer-table lines into one block per question."""
+
+    def __init__(self):
+        self.block = []
+
+    def feed(self, text):
+        text += "\n"
+        for pattern in ANSWER_PAGE_JUNK:
+            text = pattern.sub("", text)
+        for line in text.splitlines():
+            if ANSWER_ROW.match(line) and self.block:
+                yield self.parse_block("\n".join(self.block))
+                self.block = []
+            if line.strip() and (self.block or ANSWER_ROW.match(line)):
+                self.block.append(line.rstrip())
+
+    def close(self):
+        if self.block:
+            yield self.parse_block("\n".join(self.block))
+            self.block = []
+
+    @staticmethod
+    def parse_block(block):
+        num_match = ANSWER_ID.match(block)
+        ans_match = ANSWER_LABELS.search(block)
+        answers = []
+        if ans_match:
+            answers = [a.strip().upper() for a in LABEL_SEPARATOR.split(ans_match.group(1)) if a.strip()]
+        lo_match = LEARNING_OBJECTIVE.search(block)
+        return {
+            "question_id": num_match.group(1).strip() if num_match else None,
+            "answers": answers,
+            # Keep the entire explanation, minus the "1 a,b" row header
+            "explanation": ANSWER_ROW.sub("", block, count=1).strip(),
+            "learning_objective": lo_match.group(1) if lo_match else None,
+            "klevel": lo_match.group(2) if lo_match else None,
+            "points": int(lo_match.group(3)) if lo_match else 1,
+        }
+
+
+def extract_exam(questions_pdf, answers_pdf, questions_first_page=6, answers_first_page=7,
+                 workers=None, cache=None):
+    """Return the joined question records of a sample exam, in answer order."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Both documents are queued before either is consumed so every core
+        # stays busy while the parsers run.
+        question_pages = iter_page_texts(executor, questions_pdf, questions_first_page, cache=cache)
+        answer_pages = iter_page_texts(executor, answers_pdf, answers_first_page, cache=cache)
+
+        questions = QuestionParser()
+        by_id = {}
+        for text in question_pages:
+            for question in questions.feed(text):
+                by_id[question["question_id"]] = question
+
+        answers = AnswerParser()
+        records = []
+        for text in answer_pages:
+            records.extend(answers.feed(text))
+        records.extend(answers.close())
+
+    joined = []
+    for answer in records:
+        question = by_id.get(answer["question_id"])
+        if question is None:
+            continue
+        joined.append({
+            "question_id": answer["question_id"],
+            "question_text": question["question_text"] + "\n Select " + str(question["select_count"]) + " option(s).",
+            "options": question["options"],
+            "answers": answer["answers"],
+            "explanation": answer["explanation"],
+            "learning_objective": answer["learning_objective"],
+            "klevel": answer["klevel"],
+            "points": answer["points"],
+        })
+    return joined
+
+
+def write_jsonl(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("questions_pdf")
+    parser.add_argument("answers_pdf")
+    parser.add_argument("-o", "--output", default="questions.jsonl")
+    parser.add_argument("--questions-first-page", type=int, default=6)
+    parser.add_argument("--answers-first-page", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Where extracted page texts are cached.")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-run the layout analysis.")
+    args = parser.parse_args(argv)
+
+    records = extract_exam(
+        args.questions_pdf,
+        args.answers_pdf,
+        questions_first_page=args.questions_first_page,
+        answers_first_page=args.answers_first_page,
+        workers=args.workers,
+        cache=None if args.no_cache else PageTextCache(args.cache_dir),
+    )
+    write_jsonl(records, args.output)
+    print(f"Wrote {len(records)} questions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
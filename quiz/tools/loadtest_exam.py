@@ -0,0 +1,109 @@
+"""Load test a mock exam page with concurrent exam takers.
+
+Each simulated taker has its own session: it opens the exam, answers
+``--answers`` questions (one POST + redirect each) and submits. The report
+gives throughput, latency percentiles and failed requests, which under
+SQLite lock contention show up as 500s ("database is locked").
+
+Compare the database profiles by running the server twice:
+
+    SQLITE_TUNING=0 DB_CONN_MAX_AGE=0 gunicorn drimvision.wsgi ...
+    gunicorn drimvision.wsgi ...
+
+    python quiz/tools/loadtest_exam.py http://localhost:8000/mock-exam/ \\
+        --users 20 --answers 10
+"""
+import argparse
+import http.cookiejar
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+CHOICE = re.compile(r'name="(q_\d+)"\s+value="([^"]+)"')
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = {}
+
+    def record(self, started, status):
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.latencies.append(elapsed)
+            if status != 200:
+                self.errors[status] = self.errors.get(status, 0) + 1
+
+
+def request(opener, stats, url, data=None):
+    """Return the body and the final URL, after redirects, of a request."""
+    if data is not None:
+        data = urllib.parse.urlencode(data).encode()
+    started = time.perf_counter()
+    try:
+        with opener.open(url, data=data, timeout=60) as response:
+            body = response.read().decode()
+            stats.record(started, response.status)
+            return body, response.geturl()
+    except urllib.error.HTTPError as error:
+        stats.record(started, error.code)
+    except urllib.error.URLError:
+        stats.record(started, "connection error")
+    return "", url
+
+
+def take_exam(url, answers, stats):
+    opener = urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+    )
+    html, url = request(opener, stats, url)
+    for index in range(answers + 1):
+        token = CSRF_TOKEN.search(html)
+        choice = CHOICE.search(html)
+        if not token or not choice:
+            return
+        data = {"csrfmiddlewaretoken": token.group(1), choice.group(1): choice.group(2)}
+        if index < answers:
+            # Answer and move on; the redirect to the next question (?q=...)
+            # is followed and the next answer is posted there
+            data["next"] = ""
+        html, url = request(opener, stats, url, data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("url", help="URL of a live MockExamPage")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent exam takers.")
+    parser.add_argument("--rounds", type=int, default=3, help="Exams taken by each user.")
+    parser.add_argument("--answers", type=int, default=10, help="Questions answered per exam.")
+    args = parser.parse_args(argv)
+
+    stats = Stats()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for _ in range(args.users * args.rounds):
+            pool.submit(take_exam, args.url, args.answers, stats)
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(stats.latencies)
+    if not latencies:
+        parser.error("no request was made")
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"{len(latencies)} requests in {elapsed:.1f}s: {len(latencies) / elapsed:.1f} req/s")
+    print(
+        f"latency p50 {quantiles[49] * 1000:.0f}ms, p95 {quantiles[94] * 1000:.0f}ms, "
+        f"p99 {quantiles[98] * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms"
+    )
+    failed = sum(stats.errors.values())
+    print(f"failed: {failed}" + (f" {stats.errors}" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from wagtail.models import Page
+from wagtail.search.backends import get_search_backends
+
+logger = logging.getLogger(__name__)
+
+UPDATE = "update"
+DELETE = "delete"
+
+
+def _get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def update_objects(model, pks):
+    """Write the index entries of ``model`` objects, in one bulk call per
+    search backend and specific type."""
+    objects = model.get_indexed_objects().filter(pk__in=pks)
+    if issubclass(model, Page):
+        # Pages are indexed with the fields of their specific type
+        objects = objects.specific()
+    by_type = defaultdict(list)
+    for obj in objects:
+        by_type[type(obj)].append(obj)
+    for backend in get_search_backends():
+        for obj_model, obj_list in by_type.items():
+            backend.add_bulk(obj_model, obj_list)
+
+
+def delete_objects(model, pks):
+    for backend in get_search_backends():
+        for pk in pks:
+            backend.delete(model(pk=pk))
+
+
+class IndexQueue:
+    """Search index updates, deduplicated per object and written in batches
+    by a background thread.
+
+    ``enqueue`` is called on commit of every save or delete of an indexed
+    model. The worker waits ``SEARCH_INDEX_QUEUE_DELAY`` seconds for more
+    changes, then writes at most ``SEARCH_INDEX_BATCH_SIZE`` objects per
+    model and backend call. With ``SEARCH_INDEX_BACKGROUND`` off, updates are
+    written at once in the calling thread. Updates still queued when the
+    process dies are lost; ``manage.py reindex_changed`` picks them up.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def enqueue(self, model, pk, action=UPDATE):
+        key = (model._meta.label, pk)
+        with self._condition:
+            # The last change wins: an update then a delete is a delete
+            self._pending[key] = action
+            if _get_setting("SEARCH_INDEX_BACKGROUND", True):
+                self._start_worker()
+                self._condition.notify()
+        if not _get_setting("SEARCH_INDEX_BACKGROUND", True):
+            self.flush()
+
+    def _start_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="search-index-queue", daemon=True
+            )
+            self._worker.start()
+
+    def _take(self):
+        with self._condition:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def flush(self):
+        """Write every pending update now."""
+        pending = self._take()
+        if not pending:
+            return 0
+        by_model = defaultdict(lambda: defaultdict(list))
+        for (label, pk), action in pending.items():
+            by_model[label][action].append(pk)
+
+        batch_size = _get_setting("SEARCH_INDEX_BATCH_SIZE", 100)
+        for label, actions in by_model.items():
+            model = apps.get_model(label)
+            for action, pks in actions.items():
+                write = update_objects if action == UPDATE else delete_objects
+                for start in range(0, len(pks), batch_size):
+                    try:
+                        write(model, pks[start:start + batch_size])
+                    except Exception:
+                        logger.exception("Failed to %s %s search index entries", action, label)
+        return len(pending)
+
+    def _run(self):
+        delay = _get_setting("SEARCH_INDEX_QUEUE_DELAY", 2)
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # Let a burst of saves (a publish touches several rows) coalesce
+            time.sleep(delay)
+            try:
+                self.flush()
+            finally:
+                # The worker's own connections; don't hold them between batches
+                connections.close_all()
+
+
+index_queue = IndexQueue()
+atexit.register(index_queue.flush)
+
+
+def enqueue_on_commit(instance, action=UPDATE):
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: index_queue.enqueue(model, pk, action))
@@ -0,0 +1,81 @@
+import time
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from wagtail.models import ModelLogEntry, PageLogEntry
+from wagtail.search.index import class_is_indexed
+
+from search.index_queue import delete_objects, update_objects
+from search.models import IndexWatermark
+
+WATERMARK = "default"
+
+
+class Command(BaseCommand):
+    help = (
+        "Reindex the objects changed since the last run (or --since), as "
+        "recorded by Wagtail's page and model log entries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="ISO 8601 date-time; defaults to the last run.")
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        started_at = timezone.now()
+        since = self.get_since(options["since"])
+
+        changed = defaultdict(set)
+        entries = [
+            PageLogEntry.objects.filter(timestamp__gte=since).values_list("content_type_id", "page_id"),
+            ModelLogEntry.objects.filter(timestamp__gte=since).values_list("content_type_id", "object_id"),
+        ]
+        for rows in entries:
+            for content_type_id, object_id in rows.distinct():
+                changed[content_type_id].add(str(object_id))
+
+        started = time.perf_counter()
+        updated = deleted = 0
+        batch_size = options["batch_size"]
+        for content_type_id, object_ids in changed.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is None or not class_is_indexed(model):
+                continue
+            pks = [model._meta.pk.to_python(object_id) for object_id in object_ids]
+            existing = set(model._default_manager.filter(pk__in=pks).values_list("pk", flat=True))
+            gone = [pk for pk in pks if pk not in existing]
+            existing = sorted(existing)
+            for start in range(0, len(existing), batch_size):
+                update_objects(model, existing[start:start + batch_size])
+            if gone:
+                delete_objects(model, gone)
+            updated += len(existing)
+            deleted += len(gone)
+
+        IndexWatermark.objects.update_or_create(
+            name=WATERMARK, defaults={"updated_at": started_at}
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Reindexed {updated} and removed {deleted} objects changed since "
+            f"{since.isoformat()} in {elapsed:.2f}s."
+        ))
+
+    def get_since(self, value):
+        if value:
+            since = parse_datetime(value)
+            if since is None:
+                raise CommandError(f"Invalid --since date-time {value!r}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            return since
+        watermark = IndexWatermark.objects.filter(name=WATERMARK).first()
+        if watermark is None:
+            raise CommandError(
+                "No watermark recorded yet: run update_index, then "
+                "reindex_changed --since <the time update_index started>."
+            )
+        return watermark.updated_at
@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class IndexWatermark(models.Model):
+    """When the search index was last known to be complete, see the
+    reindex_changed management command."""
+
+    name = models.CharField(max_length=50, unique=True)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.updated_at}"
@@ -0,0 +1,134 @@
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+from wagtail.blocks import StreamValue
+from wagtail.models import Page
+
+from base.cache import bump_version, get_version
+from base.search_text import TEXT, stream_search_text
+
+# Bumped whenever a page is published, unpublished, moved or deleted; cached
+# result lists are keyed on it so they never outlive a change.
+VERSION_KEY = "search:version"
+RESULTS_KEY = "search:results:{digest}:{version}"
+MAX_QUERY_LENGTH = 200
+# Fields the result snippet is taken from, first non-empty wins
+SNIPPET_FIELDS = ["search_description", "intro", "body"]
+SNIPPET_LENGTH = 200
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Return the canonical form of a query, so that "Wagtail  Tips" and
+    "wagtail tips" share one cache entry. Empty queries normalize to ``""``."""
+    query = unicodedata.normalize("NFKC", query or "").casefold()
+    return WHITESPACE.sub(" ", query).strip()[:MAX_QUERY_LENGTH]
+
+
+def invalidate_search_results():
+    bump_version(VERSION_KEY)
+
+
+def get_max_results():
+    return getattr(settings, "SEARCH_MAX_RESULTS", 500)
+
+
+def get_result_ids(query):
+    """Return ``(page id, content type id)`` pairs for the live pages
+    matching a normalized query, best match first.
+
+    The full-text query runs once per query and content version; later
+    requests, pagination included, reuse the cached ids.
+    """
+    if not query:
+        return []
+    digest = hashlib.sha1(query.encode()).hexdigest()
+    key = RESULTS_KEY.format(digest=digest, version=get_version(VERSION_KEY))
+    ids = cache.get(key)
+    if ids is None:
+        results = Page.objects.live().search(query)[:get_max_results()]
+        ids = [(page.pk, page.content_type_id) for page in results]
+        cache.set(key, ids, getattr(settings, "SEARCH_RESULTS_CACHE_TIMEOUT", 60 * 10))
+    return ids
+
+
+def plain_text(value):
+    if isinstance(value, StreamValue):
+        value = stream_search_text(value).get(TEXT, "")
+    return WHITESPACE.sub(" ", strip_tags(str(value or ""))).strip()
+
+
+def highlight(text, query, length=SNIPPET_LENGTH):
+    """Return an excerpt of ``text`` around the first query term it contains,
+    HTML-escaped, with the query terms wrapped in ``<mark>``."""
+    terms = [re.escape(term) for term in query.split()]
+    pattern = re.compile("(%s)" % "|".join(terms), re.IGNORECASE) if terms else None
+    match = pattern.search(text) if pattern else None
+    start = max(0, match.start() - length // 4) if match else 0
+    end = start + length
+    # Odd items of the split are the matched terms
+    parts = pattern.split(text[start:end]) if pattern else [text[start:end]]
+    html = "".join(
+        f"<mark>{escape(part)}</mark>" if i % 2 else escape(part)
+        for i, part in enumerate(parts)
+    )
+    return mark_safe(("…" if start else "") + html + ("…" if end < len(text) else ""))
+
+
+class SearchHit:
+    """A search result: the specific page plus what its card shows, computed
+    once when the results page is built."""
+
+    __slots__ = ("page", "url", "title", "date", "type_name", "snippet")
+
+    def __init__(self, page, query, request=None):
+        self.page = page
+        self.url = page.get_url(request=request)
+        self.title = page.title
+        self.date = getattr(page, "date", None)
+        self.type_name = page._meta.verbose_name
+        texts = (plain_text(getattr(page, name, "")) for name in SNIPPET_FIELDS)
+        self.snippet = highlight(next(filter(None, texts), ""), query)
+
+    def __str__(self):
+        return self.title
+
+
+def hydrate(hits):
+    """Return the specific pages for ``(page id, content type id)`` pairs, in
+    the same order, with one query per content type."""
+    ids_by_type = defaultdict(list)
+    for page_id, content_type_id in hits:
+        ids_by_type[content_type_id].append(page_id)
+    pages = {}
+    for content_type_id, page_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is not None:
+            pages.update(model.objects.live().filter(pk__in=page_ids).in_bulk())
+    return [pages[page_id] for page_id, _ in hits if page_id in pages]
+
+
+def search_pages(query, page_number, per_page=10, request=None):
+    """Return a paginator page of ``SearchHit`` for the pages matching
+    ``query``.
+
+    Pagination slices the cached id list, so only the pages shown are
+    loaded from the database. ``is_capped`` tells whether more pages than
+    ``SEARCH_MAX_RESULTS`` matched.
+    """
+    query = normalize_query(query)
+    paginator = Paginator(get_result_ids(query), per_page)
+    page = paginator.get_page(page_number)
+    page.is_capped = paginator.count >= get_max_results()
+    page.object_list = [
+        SearchHit(result, query, request) for result in hydrate(page.object_list)
+    ]
+    return page
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag
+from wagtail.models import Page
+from wagtail.search.index import get_indexed_models
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from search.index_queue import DELETE, enqueue_on_commit
+from search.services import invalidate_search_results
+from search.suggest import suggestion_index
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def page_changed(sender, instance, **kwargs):
+    invalidate_search_results()
+    suggestion_index.update_page(instance)
+
+
+@receiver(post_page_move)
+def page_moved(sender, instance, **kwargs):
+    invalidate_search_results()
+    # Descendant URLs change too
+    suggestion_index.invalidate()
+
+
+@receiver(post_delete)
+def page_deleted(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        invalidate_search_results()
+        suggestion_index.remove_page(instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, **kwargs):
+    suggestion_index.update_tag(instance)
+
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, instance, **kwargs):
+    suggestion_index.remove_tag(instance.pk)
+
+
+def index_object(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enqueue_on_commit(instance)
+
+
+def unindex_object(sender, instance, **kwargs):
+    enqueue_on_commit(instance, DELETE)
+
+
+# Replaces Wagtail's synchronous index updates (AUTO_UPDATE is off)
+for model in get_indexed_models():
+    if getattr(model, "search_auto_update", True):
+        post_save.connect(index_object, sender=model)
+        post_delete.connect(unindex_object, sender=model)
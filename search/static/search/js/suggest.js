@@ -0,0 +1,26 @@
+// Fills the search box's datalist with title and tag suggestions as the
+// reader types.
+document.querySelectorAll('input[data-suggest-url]').forEach((input) => {
+  const list = document.getElementById(input.getAttribute('list'));
+  let timer;
+
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    const query = input.value.trim();
+    if (query.length < 2) {
+      list.replaceChildren();
+      return;
+    }
+    timer = setTimeout(async () => {
+      const url = `${input.dataset.suggestUrl}?query=${encodeURIComponent(query)}`;
+      const response = await fetch(url);
+      if (!response.ok) return;
+      const data = await response.json();
+      list.replaceChildren(...data.suggestions.map((suggestion) => {
+        const option = document.createElement('option');
+        option.value = suggestion.label;
+        return option;
+      }));
+    }, 100);
+  });
+});
@@ -0,0 +1,134 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from django.conf import settings
+from taggit.models import Tag
+from wagtail.models import Page
+
+from search.services import normalize_query
+
+Suggestion = namedtuple("Suggestion", ["kind", "label", "url"])
+
+
+def _tokens(label):
+    """Keys a label is found under: the label itself and its tail from every
+    word on, so "Wagtail tips" matches both "wag" and "tip"."""
+    words = normalize_query(label).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def _tag_index_url():
+    from blog.models import BlogTagIndexPage
+
+    tag_index = BlogTagIndexPage.objects.live().first()
+    return tag_index.url if tag_index else None
+
+
+def _tag_suggestion(tag, tag_index_url):
+    url = f"{tag_index_url}?tag={tag.slug}" if tag_index_url else None
+    return Suggestion("tag", tag.name, url)
+
+
+class PrefixIndex:
+    """In-memory index of live page titles and tags, searched by prefix.
+
+    Keys are kept in a sorted list of ``(token, entry key)`` pairs, so a
+    lookup is a bisection plus a scan over the matching range. Entries are
+    updated one at a time from publish and tag signals; the whole index is
+    rebuilt once older than ``SEARCH_SUGGEST_REBUILD_INTERVAL`` so that
+    processes which missed a signal converge.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._entries = {}
+        self._tokens = {}
+        self._built_at = None
+
+    def _add(self, entry_key, suggestion):
+        self._remove(entry_key)
+        self._entries[entry_key] = suggestion
+        self._tokens[entry_key] = _tokens(suggestion.label)
+        for token in self._tokens[entry_key]:
+            insort(self._keys, (token, entry_key))
+
+    def _remove(self, entry_key):
+        for token in self._tokens.pop(entry_key, ()):
+            position = bisect_left(self._keys, (token, entry_key))
+            if position < len(self._keys) and self._keys[position] == (token, entry_key):
+                del self._keys[position]
+        self._entries.pop(entry_key, None)
+
+    def rebuild(self):
+        pages = Page.objects.live().filter(depth__gt=1)
+        entries = {("page", page.pk): Suggestion("page", page.title, page.url) for page in pages}
+        tag_index_url = _tag_index_url()
+        for tag in Tag.objects.all():
+            entries[("tag", tag.pk)] = _tag_suggestion(tag, tag_index_url)
+        tokens = {entry_key: _tokens(s.label) for entry_key, s in entries.items()}
+        keys = sorted(
+            (token, entry_key) for entry_key, entry_tokens in tokens.items()
+            for token in entry_tokens
+        )
+        with self._lock:
+            self._entries = entries
+            self._tokens = tokens
+            self._keys = keys
+            self._built_at = time.monotonic()
+
+    def is_stale(self):
+        interval = getattr(settings, "SEARCH_SUGGEST_REBUILD_INTERVAL", 60 * 10)
+        return self._built_at is None or time.monotonic() - self._built_at > interval
+
+    def invalidate(self):
+        self._built_at = None
+
+    def update_page(self, page):
+        # Not yet built: the first lookup loads everything anyway
+        if self._built_at is None:
+            return
+        with self._lock:
+            if page.live:
+                self._add(("page", page.pk), Suggestion("page", page.title, page.url))
+            else:
+                self._remove(("page", page.pk))
+
+    def remove_page(self, page_id):
+        with self._lock:
+            self._remove(("page", page_id))
+
+    def update_tag(self, tag):
+        if self._built_at is None:
+            return
+        suggestion = _tag_suggestion(tag, _tag_index_url())
+        with self._lock:
+            self._add(("tag", tag.pk), suggestion)
+
+    def remove_tag(self, tag_id):
+        with self._lock:
+            self._remove(("tag", tag_id))
+
+    def lookup(self, prefix, limit=8):
+        """Return up to ``limit`` suggestions whose title or tag has a word
+        starting with ``prefix``; titles before tags, then alphabetically."""
+        prefix = normalize_query(prefix)
+        if not prefix:
+            return []
+        if self.is_stale():
+            self.rebuild()
+        with self._lock:
+            found = {}
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(found) < limit:
+                token, entry_key = self._keys[position]
+                if not token.startswith(prefix):
+                    break
+                found.setdefault(entry_key, self._entries[entry_key])
+                position += 1
+        return sorted(found.values(), key=lambda s: (s.kind != "page", s.label.casefold()))
+
+
+suggestion_index = PrefixIndex()
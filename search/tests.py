@@ -0,0 +1,192 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from wagtail.models import Site
+
+from blog.models import BlogIndexPage, BlogPage, BlogTagIndexPage
+from blog.testing import BlogTestMixin
+from search.index_queue import index_queue, update_objects
+from search.models import IndexWatermark
+from search.services import get_result_ids, highlight, hydrate, normalize_query
+from search.suggest import suggestion_index
+
+
+class NormalizeQueryTests(SimpleTestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_query("  Wagtail\tTIPS  "), "wagtail tips")
+        self.assertEqual(normalize_query("ＳＴＲＡẞE"), "strasse")
+        self.assertEqual(normalize_query(None), "")
+
+
+class SearchViewTests(BlogTestMixin, TestCase):
+    """
+    Tests for the cached search results.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.blog = self.make_index()
+
+    def search(self, query, page=1):
+        return self.client.get("/search/", {"query": query, "page": page}).context["search_results"]
+
+    def test_pages_are_sliced_from_cached_ids(self):
+        for i in range(12):
+            self.make_post(self.blog, f"Kubernetes post {i}")
+        first = self.search("kubernetes")
+        self.assertEqual(first.paginator.count, 12)
+        self.assertIsInstance(first[0].page, BlogPage)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.search("  KUBERNETES ", page=2)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(any("wagtailsearch" in query["sql"] for query in queries))
+
+    @override_settings(SEARCH_MAX_RESULTS=3)
+    def test_result_count_reports_the_cap(self):
+        for i in range(4):
+            self.make_post(self.blog, f"Helm chart {i}")
+        response = self.client.get("/search/", {"query": "helm"})
+        self.assertEqual(response.context["search_results"].paginator.count, 3)
+        self.assertContains(response, "3+ results found.")
+        self.assertFalse(self.search("helm chart 1").is_capped)
+
+    def test_results_refreshed_on_publish(self):
+        self.make_post(self.blog, "Terraform basics")
+        self.assertEqual(self.search("terraform").paginator.count, 1)
+        self.make_post(self.blog, "Terraform modules")
+        self.assertEqual(self.search("terraform").paginator.count, 2)
+
+
+class SearchHitTests(BlogTestMixin, TestCase):
+    """
+    Tests for the search result cards.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.root = Site.objects.get(is_default_site=True).root_page
+
+    def test_hits_are_hydrated_with_one_query_per_type(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            blog = self.root.add_child(instance=BlogIndexPage(title="Ansible blog", slug="blog"))
+        for i in range(3):
+            self.make_post(
+                blog, f"Ansible post {i}", intro="Automating servers with Ansible & friends"
+            )
+        hits = get_result_ids(normalize_query("ansible"))
+        self.assertEqual(len(hits), 4)
+
+        with self.assertNumQueries(2):
+            pages = hydrate(hits)
+        self.assertEqual([page.pk for page in pages], [page_id for page_id, _ in hits])
+
+        response = self.client.get("/search/", {"query": "ansible"})
+        self.assertContains(response, '<ol class="search-results">', count=1)
+        self.assertNotContains(response, "{#")
+        post_hit = next(hit for hit in response.context["search_results"] if hit.date)
+        self.assertEqual(
+            post_hit.snippet,
+            "Automating servers with <mark>Ansible</mark> &amp; friends",
+        )
+
+    def test_highlight_excerpt(self):
+        text = "x" * 300 + " Wagtail <b> tips " + "y" * 300
+        html = highlight(text, "wagtail tips")
+        self.assertTrue(html.startswith("…"))
+        self.assertTrue(html.endswith("…"))
+        self.assertIn("<mark>Wagtail</mark> &lt;b&gt; <mark>tips</mark>", html)
+
+
+class SuggestTests(BlogTestMixin, TestCase):
+    """
+    Tests for the search/suggest/ endpoint.
+    """
+
+    def setUp(self):
+        suggestion_index.invalidate()
+        self.addCleanup(suggestion_index.invalidate)
+        self.blog = self.make_index()
+        root = Site.objects.get(is_default_site=True).root_page
+        root.add_child(instance=BlogTagIndexPage(title="Tags", slug="tags"))
+
+    def suggest(self, query):
+        return self.client.get("/search/suggest/", {"query": query}).json()["suggestions"]
+
+    def test_title_and_tag_prefixes(self):
+        post = self.make_post(self.blog, "Wagtail Tips and Tricks", tags=["Wagtail"])
+        self.suggest("wa")  # build the index
+
+        with self.assertNumQueries(0):
+            suggestions = self.suggest("WAG")
+        self.assertEqual(suggestions, [
+            {"kind": "page", "label": "Wagtail Tips and Tricks", "url": post.url},
+            {"kind": "tag", "label": "Wagtail", "url": "/tags/?tag=wagtail"},
+        ])
+        self.assertEqual([s["label"] for s in self.suggest("tric")], ["Wagtail Tips and Tricks"])
+        self.assertEqual(self.suggest("w"), [])
+
+    def test_index_follows_publish_and_unpublish(self):
+        self.suggest("wa")
+        post = self.make_post(self.blog, "Docker volumes", tags=["containers"])
+        self.assertEqual([s["label"] for s in self.suggest("dock")], ["Docker volumes"])
+        self.assertEqual([s["label"] for s in self.suggest("contain")], ["containers"])
+        post.unpublish()
+        self.assertEqual(self.suggest("dock"), [])
+
+
+@override_settings(SEARCH_INDEX_BACKGROUND=True)
+class IndexQueueTests(BlogTestMixin, TestCase):
+    """
+    Tests for the batched search index updates and reindex_changed.
+    """
+
+    def setUp(self):
+        cache.clear()
+        # Run the queue by hand instead of in a worker thread
+        patcher = mock.patch.object(index_queue, "_start_worker")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(index_queue._take)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog = self.make_index()
+        index_queue.flush()
+
+    def result_count(self, query):
+        cache.clear()
+        return len(get_result_ids(query))
+
+    def test_updates_are_deduplicated_and_written_on_flush(self):
+        post = self.make_post(self.blog, "Prometheus alerts")
+        self.assertEqual(self.result_count("prometheus"), 0)
+        with mock.patch("search.index_queue.update_objects", wraps=update_objects) as update:
+            self.assertEqual(index_queue.flush(), 1)
+        update.assert_called_once_with(BlogPage, [post.pk])
+        self.assertEqual(self.result_count("prometheus"), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        index_queue.flush()
+        self.assertEqual(self.result_count("prometheus"), 0)
+
+    def test_reindex_changed_picks_up_lost_updates(self):
+        since = timezone.now()
+        self.make_post(self.blog, "Grafana dashboards")
+        index_queue._take()  # the process died before flushing
+        self.assertEqual(self.result_count("grafana"), 0)
+
+        call_command("reindex_changed", since=since.isoformat(), stdout=StringIO())
+        self.assertEqual(self.result_count("grafana"), 1)
+        self.assertTrue(IndexWatermark.objects.filter(updated_at__gte=since).exists())
+
+        # Later runs start from the watermark
+        out = StringIO()
+        call_command("reindex_changed", stdout=out)
+        self.assertIn("Reindexed 0", out.getvalue())
@@ -1,7 +1,11 @@
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.http import JsonResponse
 from django.template.response import TemplateResponse
 
-from wagtail.models import Page
+from search.services import search_pages
+from search.suggest import suggestion_index
+
+SUGGEST_MIN_LENGTH = 2
+SUGGEST_LIMIT = 8
 
 # To enable logging of search queries for use with the "Promoted search results" module
 # <https://docs.wagtail.org/en/stable/reference/contrib/searchpromotions.html>
@@ -15,26 +19,14 @@ def search(request):
     search_query = request.GET.get("query", None)
     page = request.GET.get("page", 1)
 
-    # Search
-    if search_query:
-        search_results = Page.objects.live().search(search_query)
-
-        # To log this query for use with the "Promoted search results" module:
-
-        # query = Query.get(search_query)
-        # query.add_hit()
+    # Search, paginated over the cached result ids
+    search_results = search_pages(search_query, page, request=request)
 
-    else:
-        search_results = Page.objects.none()
+    # To log this query for use with the "Promoted search results" module:
 
-    # Pagination
-    paginator = Paginator(search_results, 10)
-    try:
-        search_results = paginator.page(page)
-    except PageNotAnInteger:
-        search_results = paginator.page(1)
-    except EmptyPage:
-        search_results = paginator.page(paginator.num_pages)
+    # if search_query:
+    #     query = Query.get(search_query)
+    #     query.add_hit()
 
     return TemplateResponse(
         request,
@@ -44,3 +36,15 @@ def search(request):
             "search_results": search_results,
         },
     )
+
+
+def suggest(request):
+    """Title and tag suggestions for the first letters of a query, as JSON."""
+    prefix = request.GET.get("query", "")
+    suggestions = []
+    if len(prefix.strip()) >= SUGGEST_MIN_LENGTH:
+        suggestions = [
+            suggestion._asdict()
+            for suggestion in suggestion_index.lookup(prefix, SUGGEST_LIMIT)
+        ]
+    return JsonResponse({"query": prefix, "suggestions": suggestions})